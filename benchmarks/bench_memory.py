@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Peak memory of scaffolding large synthetic trees.
+
+Each size runs in a fresh interpreter so its peak RSS is its own. The
+headline figure is the total peak RSS of the process. Alongside it come
+the peak once the plan is compiled, after executing it into an empty
+directory (cold) and after re-running it over the result (warm); the
+difference between the last two and the first is what execution itself
+costs. With streaming execution that should not grow with the bytes
+written, only with the per-file bookkeeping (paths and manifest records).
+
+"shared" plans give every file the same body; "unique" plans give each
+file its own, which also exercises the bases file kept for --upgrade.
+These synthetic plans hold literal bodies, so with "unique" the plan
+itself grows with the bytes in the tree; only template-backed plans, like
+the Treasure Hunter one, keep their bodies out of memory until rendered.
+
+Usage: python benchmarks/bench_memory.py [--sizes 1000,10000,100000]
+                                         [--shape shared|unique] [--root DIR]
+                                         [--file-size 2048]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+
+from common import load_setup_module, remove, scratch_dir, synthetic_plan
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def child(size, shape, root, file_size):
+    """Measure one size in this process and print the figures as JSON"""
+    setup = load_setup_module()
+    compiled = synthetic_plan(setup, size, file_size=file_size, unique=shape == "unique").compile()
+    figures = {"plan_mb": peak_rss_mb()}
+    target = scratch_dir(root)
+    try:
+        for run in ("cold", "warm"):
+            backend = setup.DiskBackend(target)
+            try:
+                setup.execute_plan(compiled, backend, reporter=setup.Reporter("quiet"))
+            finally:
+                backend.close()
+            figures[f"{run}_mb"] = peak_rss_mb()
+    finally:
+        remove(target)
+    print(json.dumps(figures))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--shape", choices=("shared", "unique"), default="shared")
+    parser.add_argument("--root", default="/dev/shm" if os.path.isdir("/dev/shm") else None,
+                        help="directory to scaffold under (default: /dev/shm when available)")
+    parser.add_argument("--file-size", type=int, default=2048)
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child is not None:
+        child(args.child, args.shape, args.root, args.file_size)
+        return
+
+    print(f"{'files':>8} {'peak MB':>9} {'plan MB':>9} {'cold MB':>9} {'warm MB':>9} {'execution MB':>13}"
+          f"  ({args.shape} bodies)")
+    for size in (int(value) for value in args.sizes.split(",")):
+        command = [sys.executable, os.path.abspath(__file__), "--child", str(size), "--shape", args.shape,
+                   "--file-size", str(args.file_size)]
+        if args.root:
+            command += ["--root", args.root]
+        figures = json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+        peak = max(figures["cold_mb"], figures["warm_mb"])
+        print(f"{size:>8} {peak:>9.1f} {figures['plan_mb']:>9.1f} {figures['cold_mb']:>9.1f} "
+              f"{figures['warm_mb']:>9.1f} {peak - figures['plan_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
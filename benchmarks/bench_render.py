@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Compare the template renderer with naive str.format re-rendering.
+
+Renders every template for 1,000 variants of API_BASE_URL/PACKAGE_NAME:
+once with all variants distinct, then again as a second batch of
+workspaces that reuses the same variants (the render cache case).
+
+Usage: python benchmarks/bench_render.py [--variants N]
+"""
+import argparse
+import re
+
+from common import load_setup_module, timed
+
+
+def naive_render(source, variables):
+    """What a format-based renderer does on every call"""
+    text = source.decode("utf-8").replace("{", "{{").replace("}", "}}")
+    text = re.sub(r"@@([A-Z][A-Z0-9_]*)@@", r"{\1}", text)
+    return text.format(**variables).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variants", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup = load_setup_module()
+    templates = setup.load_templates()
+    names = templates.names()
+    variants = [
+        {"API_BASE_URL": f"https://tenant{index}.example.com", "PACKAGE_NAME": f"tenant-{index}"}
+        for index in range(args.variants)
+    ]
+
+    def run_naive():
+        for overrides in variants:
+            variables = dict(setup.freeze_variables(overrides))
+            for name in names:
+                naive_render(templates.get(name), variables)
+
+    renderer = setup.TemplateRenderer(templates, cache_size=len(names) * args.variants)
+    frozen = [setup.freeze_variables(overrides) for overrides in variants]
+
+    def run_engine():
+        for variables in frozen:
+            for name in names:
+                renderer.render(name, variables)
+
+    naive = timed(run_naive)
+    cold = timed(run_engine)
+    warm = timed(run_engine)
+    assert renderer.render(names[0], frozen[0]) == naive_render(templates.get(names[0]), dict(frozen[0]))
+    renders = len(names) * args.variants
+    print(f"{renders} renders ({len(names)} templates x {args.variants} variants)")
+    print(f"str.format re-render  {naive * 1000:8.1f} ms")
+    print(f"compiled, cold cache  {cold * 1000:8.1f} ms  {naive / cold:6.1f}x")
+    print(f"compiled, warm cache  {warm * 1000:8.1f} ms  {naive / warm:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Measure cold start of the set-up.py command line.
+
+Each sample is a fresh interpreter, timed from spawn to exit:
+
+  interpreter  python -c pass, the floor nothing can go below
+  import       importing the command line module
+  first write  scaffolding --only project (a handful of files) into an
+               empty directory, i.e. startup plus the first writes
+  full run     scaffolding the whole plan into an empty directory
+
+It then lists the slowest imports reported by python -X importtime for a
+full run.
+
+Usage: python benchmarks/bench_startup.py [--repeat 20] [--top 12]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from common import REPO_ROOT, remove, scratch_dir
+
+SCRIPT = os.path.join(REPO_ROOT, "set-up.py")
+
+
+def sample(command, repeat, fresh_target=False):
+    """Median wall time of running command, in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        target = scratch_dir() if fresh_target else None
+        argv = [part.format(target=target) for part in command]
+        start = time.perf_counter()
+        subprocess.run(argv, check=True, stdout=subprocess.DEVNULL, cwd=REPO_ROOT)
+        samples.append(time.perf_counter() - start)
+        if target:
+            remove(target)
+    return statistics.median(samples) * 1000
+
+
+def slowest_imports(top):
+    """(cumulative microseconds, module) of the slowest imports in a full run"""
+    target = scratch_dir()
+    try:
+        result = subprocess.run([sys.executable, "-X", "importtime", SCRIPT, target, "-q"],
+                                check=True, capture_output=True, text=True, cwd=REPO_ROOT)
+    finally:
+        remove(target)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        imports.append((int(cumulative), module.rstrip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--top", type=int, default=12, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    runs = {
+        "interpreter": ([sys.executable, "-c", "pass"], False),
+        "import": ([sys.executable, "-c", "import treasure_scaffold.cli"], False),
+        "first write": ([sys.executable, SCRIPT, "{target}", "-q", "--only", "project"], True),
+        "full run": ([sys.executable, SCRIPT, "{target}", "-q"], True),
+    }
+    baseline = None
+    for label, (command, fresh_target) in runs.items():
+        elapsed = sample(command, args.repeat, fresh_target)
+        baseline = elapsed if baseline is None else baseline
+        extra = f"  (+{elapsed - baseline:.1f} over the interpreter)" if elapsed is not baseline else ""
+        print(f"{label:<12} {elapsed:7.1f} ms{extra}")
+
+    print("\nslowest imports (cumulative):")
+    for cumulative, module in slowest_imports(args.top):
+        print(f"  {cumulative / 1000:7.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Benchmark the scaffolder across plan sizes and filesystems.
+
+Scenarios, each timed against a DiskBackend with reporting off:
+
+  cold     scaffold into an empty directory
+  warm     re-run the same plan over the result (the no-op case)
+  partial  re-run with a revision of the plan that changes 5% of files
+  batch    scaffold --workspaces copies with the process pool
+
+"treasure" is the real Treasure Hunter plan (~60 entries, partial bumps
+APP_VERSION); numeric sizes are synthetic plans of that many files. Every
+run is written to a JSON file in benchmarks/results/ and compared with the
+previous one, so regressions show up run over run.
+
+Usage: python benchmarks/bench_suite.py [--sizes treasure,1000,10000,100000]
+                                        [--roots tmpfs=/dev/shm,disk=/var/tmp]
+                                        [--repeat 3] [--workspaces 8]
+                                        [--output FILE] [--baseline FILE]
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+from common import REPO_ROOT, load_setup_module, remove, scratch_dir, synthetic_plan
+
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+SCENARIOS = ("cold", "warm", "partial", "batch")
+CHANGED_EVERY = 20
+
+
+def default_roots():
+    """tmpfs when the machine has one, plus the disk-backed temp directory"""
+    roots = {}
+    if os.path.isdir("/dev/shm"):
+        roots["tmpfs"] = "/dev/shm"
+    roots["disk"] = "/var/tmp" if os.path.isdir("/var/tmp") else tempfile.gettempdir()
+    return roots
+
+
+def parse_roots(value):
+    """Parse "label=path,label=path" into a dict"""
+    roots = {}
+    for item in value.split(","):
+        label, _, path = item.partition("=")
+        roots[label] = path or label
+    return roots
+
+
+def build_plans(setup, size, file_size):
+    """Return the base and partially changed compiled plans for a size"""
+    if size == "treasure":
+        base = setup.build_treasure_hunter_plan().compile()
+        changed = setup.build_treasure_hunter_plan(variables={"APP_VERSION": "9.9.9"}).compile()
+        return base, changed
+    count = int(size)
+    return (synthetic_plan(setup, count, file_size=file_size).compile(),
+            synthetic_plan(setup, count, file_size=file_size, changed_every=CHANGED_EVERY).compile())
+
+
+def run_once(setup, compiled, target):
+    """Execute a plan on a fresh DiskBackend; returns (seconds, syscalls)"""
+    backend = setup.DiskBackend(target)
+    reporter = setup.Reporter("quiet")
+    start = time.perf_counter()
+    try:
+        setup.execute_plan(compiled, backend, reporter=reporter)
+    finally:
+        backend.close()
+    return time.perf_counter() - start, sum(backend.syscalls.values())
+
+
+def run_batch(setup, compiled, root, workspaces, processes):
+    """Scaffold several workspaces with create_many_structures"""
+    parent = scratch_dir(root)
+    targets = [os.path.join(parent, f"ws{index}") for index in range(workspaces)]
+    try:
+        start = time.perf_counter()
+        totals = setup.create_many_structures(targets, processes=processes, report="quiet", plan=compiled)
+        elapsed = time.perf_counter() - start
+    finally:
+        remove(parent)
+    return elapsed, sum(totals["syscalls"].values())
+
+
+def measure(setup, size, root, args):
+    """Collect samples for every scenario at one size on one filesystem"""
+    base, changed = build_plans(setup, size, args.file_size)
+    # Render every template once so samples measure I/O, not first-use compilation
+    for compiled in (base, changed):
+        for entry in compiled.files:
+            setup.file_payload(compiled, entry)
+    samples = {scenario: [] for scenario in SCENARIOS}
+    syscalls = {}
+    for _ in range(args.repeat):
+        target = scratch_dir(root)
+        try:
+            for scenario, compiled in (("cold", base), ("warm", base), ("partial", changed)):
+                seconds, calls = run_once(setup, compiled, target)
+                samples[scenario].append(seconds)
+                syscalls[scenario] = calls
+        finally:
+            remove(target)
+        if args.workspaces and len(base.files) * args.workspaces <= args.batch_limit:
+            seconds, calls = run_batch(setup, base, root, args.workspaces, args.processes)
+            samples["batch"].append(seconds)
+            syscalls["batch"] = calls
+    for scenario in SCENARIOS:
+        if not samples[scenario]:
+            continue
+        yield {
+            "scenario": scenario,
+            "size": size,
+            "files": len(base.files) * (args.workspaces if scenario == "batch" else 1),
+            "directories": len(base.directories),
+            "filesystem": root,
+            "median_ms": round(statistics.median(samples[scenario]) * 1000, 3),
+            "min_ms": round(min(samples[scenario]) * 1000, 3),
+            "samples_ms": [round(sample * 1000, 3) for sample in samples[scenario]],
+            "syscalls": syscalls[scenario],
+        }
+
+
+def environment():
+    """Describe the machine and revision the results were taken on"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def latest_result(exclude=None):
+    """Most recent results file, if any, other than exclude"""
+    paths = sorted(path for path in glob.glob(os.path.join(RESULTS_DIR, "*.json")) if path != exclude)
+    return paths[-1] if paths else None
+
+
+def compare(results, baseline_path, threshold):
+    """Print the change against a previous run, flagging slowdowns"""
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    previous = {(row["scenario"], row["size"], row["label"]): row for row in baseline["results"]}
+    print(f"\ncompared with {os.path.relpath(baseline_path)} ({baseline['environment'].get('commit')})")
+    for row in results:
+        before = previous.get((row["scenario"], row["size"], row["label"]))
+        if not before or not before["median_ms"]:
+            continue
+        change = row["median_ms"] / before["median_ms"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"  {row['label']:<6} {row['size']:>8} {row['scenario']:<8}"
+              f" {before['median_ms']:10.1f} -> {row['median_ms']:10.1f} ms  {change:+7.1%}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="treasure,1000,10000,100000")
+    parser.add_argument("--roots", type=parse_roots, default=None,
+                        help="label=path pairs to benchmark on (default: tmpfs and disk)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--file-size", type=int, default=1024, help="bytes per synthetic file")
+    parser.add_argument("--workspaces", type=int, default=8, help="workspaces per batch run (0 to skip)")
+    parser.add_argument("--processes", type=int, default=None, help="batch pool size (default: CPU count)")
+    parser.add_argument("--batch-limit", type=int, default=200000,
+                        help="skip batch runs that would write more files than this")
+    parser.add_argument("--output", default=None, help="results file (default: benchmarks/results/<time>.json)")
+    parser.add_argument("--baseline", default=None, help="results file to compare with (default: previous run)")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown reported as a regression")
+    args = parser.parse_args()
+
+    setup = load_setup_module()
+    roots = args.roots or default_roots()
+    results = []
+    for label, root in roots.items():
+        for size in args.sizes.split(","):
+            for row in measure(setup, size, root, args):
+                row["label"] = label
+                results.append(row)
+                print(f"{label:<6} {size:>8} {row['scenario']:<8} {row['files']:8} files"
+                      f"  {row['median_ms']:10.1f} ms  {row['syscalls']:8} syscalls")
+
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or os.path.join(RESULTS_DIR, f"{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump({"timestamp": stamp, "environment": environment(), "results": results}, handle, indent=2)
+        handle.write("\n")
+    print(f"\nresults written to {os.path.relpath(output)}")
+    baseline = args.baseline or latest_result(exclude=os.path.abspath(output))
+    if baseline:
+        compare(results, baseline, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
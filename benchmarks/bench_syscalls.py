@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Count filesystem calls made by DiskBackend with and without its snapshot.
+
+Every os-level filesystem function the scaffolder uses is wrapped with a
+counter, so the numbers are the calls issued from Python, which map
+one-to-one onto system calls.
+
+Usage: python benchmarks/bench_syscalls.py [--files N]
+"""
+import argparse
+import collections
+import contextlib
+import io
+import os
+
+from common import load_setup_module, remove, scratch_dir, synthetic_plan
+
+COUNTED = ("stat", "lstat", "mkdir", "scandir", "replace", "link", "unlink", "fstat", "fsync", "open")
+
+
+@contextlib.contextmanager
+def counting(setup):
+    """Count calls to the os functions in COUNTED and to open()"""
+    counts = collections.Counter()
+    originals = {name: getattr(os, name) for name in COUNTED}
+
+    def wrap(name, function):
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return function(*args, **kwargs)
+        return counted
+
+    for name, function in originals.items():
+        setattr(os, name, wrap(name, function))
+    from treasure_scaffold import backends
+    backends.open = wrap("open()", open)
+    try:
+        yield counts
+    finally:
+        for name, function in originals.items():
+            setattr(os, name, function)
+        del backends.open
+
+
+def run(setup, compiled, target, snapshot):
+    """Execute the plan once and return the call counts"""
+    backend = setup.DiskBackend(target, snapshot=snapshot)
+    with counting(setup) as counts, contextlib.redirect_stdout(io.StringIO()):
+        setup.execute_plan(compiled, backend)
+        backend.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000, help="size of the synthetic plan")
+    args = parser.parse_args()
+
+    setup = load_setup_module()
+    plans = {
+        "treasure hunter": setup.build_treasure_hunter_plan().compile(),
+        f"synthetic {args.files}": synthetic_plan(setup, args.files, file_size=256).compile(),
+    }
+    for label, compiled in plans.items():
+        # Load and render templates up front so only destination I/O is counted
+        for entry in compiled.files:
+            setup.file_payload(compiled, entry)
+        for snapshot in (False, True):
+            target = scratch_dir()
+            try:
+                cold = run(setup, compiled, target, snapshot)
+                warm = run(setup, compiled, target, snapshot)
+            finally:
+                remove(target)
+            mode = "snapshot" if snapshot else "per-path"
+            print(f"{label:<18} {mode:<9} cold {sum(cold.values()):6}  warm {sum(warm.values()):6}"
+                  f"   cold: {dict(sorted(cold.items()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Shared helpers for the scaffolder benchmarks"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_setup_module():
+    """Import the treasure_scaffold package that set-up.py runs"""
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    import treasure_scaffold
+    return treasure_scaffold
+
+
+def synthetic_plan(setup, file_count, files_per_dir=50, file_size=2048, changed_every=0, unique=False):
+    """Build a plan of file_count files spread over nested directories.
+
+    With changed_every=N, every Nth file gets different content, giving a
+    second revision of the same plan for partial-update runs. unique gives
+    every file a body of its own instead of one shared body.
+    """
+    plan = setup.ScaffoldPlan()
+    content = ("x" * 79 + "\n") * (file_size // 80)
+    changed = ("y" * 79 + "\n") * (file_size // 80)
+    for index in range(file_count):
+        bucket = index // files_per_dir
+        body = changed if changed_every and index % changed_every == 0 else content
+        if unique:
+            body = f"// file {index}\n{body}"
+        plan.add_file(f"pkg{bucket // 100}/mod{bucket}/file{index}.js", body)
+    return plan
+
+
+def scratch_dir(root=None):
+    """Create an empty scratch directory, optionally under root"""
+    return tempfile.mkdtemp(prefix="th-bench-", dir=root)
+
+
+def timed(func, *args, **kwargs):
+    """Return the wall time of a single call in seconds"""
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def remove(path):
+    """Remove a scratch directory"""
+    shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,189 @@
+"""Tests for the three-way merge, manifest transitions and archive output.
+
+Run from the repository root with: python -m unittest
+"""
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from treasure_scaffold import MemoryBackend, Reporter, ScaffoldPlan, execute_plan, merge3, plan_changes, write_archive
+from treasure_scaffold.constants import MANIFEST_PATH
+
+
+class Merge3Tests(unittest.TestCase):
+    BASE = b"one\ntwo\nthree\nfour\nfive\n"
+
+    def test_disjoint_edits_are_combined(self):
+        ours = b"ONE\ntwo\nthree\nfour\nfive\n"
+        theirs = b"one\ntwo\nthree\nfour\nFIVE\n"
+        self.assertEqual(merge3(self.BASE, ours, theirs), b"ONE\ntwo\nthree\nfour\nFIVE\n")
+
+    def test_identical_edits_are_taken_once(self):
+        edited = b"one\nTWO\nthree\nfour\nfive\n"
+        self.assertEqual(merge3(self.BASE, edited, edited), edited)
+
+    def test_one_sided_changes_win(self):
+        edited = b"one\nTWO\nthree\nfour\nfive\n"
+        self.assertEqual(merge3(self.BASE, self.BASE, edited), edited)
+        self.assertEqual(merge3(self.BASE, edited, self.BASE), edited)
+
+    def test_adjacent_edits_conflict(self):
+        ours = b"one\nTWO\nthree\nfour\nfive\n"
+        theirs = b"one\ntwo\nTHREE\nfour\nfive\n"
+        self.assertIsNone(merge3(self.BASE, ours, theirs))
+
+    def test_overlapping_edits_conflict(self):
+        ours = b"one\nTWO\nTHREE\nfour\nfive\n"
+        theirs = b"one\ntwo\nthree!\nfour\nfive\n"
+        self.assertIsNone(merge3(self.BASE, ours, theirs))
+
+    def test_insertions_at_both_ends(self):
+        ours = b"header\n" + self.BASE
+        theirs = self.BASE + b"footer\n"
+        self.assertEqual(merge3(self.BASE, ours, theirs), b"header\n" + self.BASE + b"footer\n")
+
+    def test_insertions_at_the_same_end_conflict(self):
+        self.assertIsNone(merge3(self.BASE, self.BASE + b"ours\n", self.BASE + b"theirs\n"))
+
+    def test_no_trailing_newline(self):
+        base = b"one\ntwo\nthree"
+        ours = b"ONE\ntwo\nthree"
+        theirs = b"one\ntwo\nthree and more"
+        self.assertEqual(merge3(base, ours, theirs), b"ONE\ntwo\nthree and more")
+
+    def test_adding_a_trailing_newline(self):
+        base = b"one\ntwo\nthree"
+        self.assertEqual(merge3(base, b"ONE\ntwo\nthree", base + b"\n"), b"ONE\ntwo\nthree\n")
+
+
+class ManifestTransitionTests(unittest.TestCase):
+    BASE = b"line 1\nline 2\nline 3\n"
+
+    def setUp(self):
+        self.backend = MemoryBackend()
+
+    def plan(self, files):
+        plan = ScaffoldPlan()
+        for path, content in files.items():
+            plan.add_file(path, content)
+        return plan.compile()
+
+    def run_plan(self, files, merge=False):
+        """Plan and then execute files; returns each path's planned action and the run's counts"""
+        compiled = self.plan(files)
+        _, changes = plan_changes(compiled, self.backend, merge=merge)
+        reporter = Reporter("quiet")
+        execute_plan(compiled, self.backend, reporter=reporter, merge=merge)
+        return {change.path: change.action for change in changes}, reporter.counts
+
+    def edit(self, path, data):
+        self.backend.write(path, data, overwrite=True)
+
+    def test_create_then_unchanged(self):
+        actions, counts = self.run_plan({"a.txt": "a\n", "docs/b.txt": "b\n"})
+        self.assertEqual(actions, {"a.txt": "create", "docs/b.txt": "create"})
+        self.assertEqual(counts["create"], 2)
+        self.assertIn(MANIFEST_PATH, self.backend.files)
+        actions, counts = self.run_plan({"a.txt": "a\n", "docs/b.txt": "b\n"})
+        self.assertEqual(actions, {"a.txt": "unchanged", "docs/b.txt": "unchanged"})
+        self.assertEqual(counts["unchanged"], 2)
+
+    def test_template_change_updates_a_pristine_file(self):
+        self.run_plan({"a.txt": "old\n"})
+        actions, counts = self.run_plan({"a.txt": "new\n"})
+        self.assertEqual(actions, {"a.txt": "update"})
+        self.assertEqual(counts["update"], 1)
+        self.assertEqual(self.backend.files["a.txt"], b"new\n")
+
+    def test_edited_file_is_left_alone(self):
+        self.run_plan({"a.txt": "old\n"})
+        self.edit("a.txt", b"mine\n")
+        actions, counts = self.run_plan({"a.txt": "new\n"})
+        self.assertEqual(actions, {"a.txt": "modified"})
+        self.assertEqual(counts["modified"], 1)
+        self.assertEqual(self.backend.files["a.txt"], b"mine\n")
+
+    def test_edit_without_template_change_is_kept(self):
+        self.run_plan({"a.txt": "old\n"})
+        self.edit("a.txt", b"mine\n")
+        actions, _ = self.run_plan({"a.txt": "old\n"})
+        self.assertEqual(actions, {"a.txt": "unchanged"})
+        self.assertEqual(self.backend.files["a.txt"], b"mine\n")
+
+    def test_merge_takes_the_template_change_into_an_edited_file(self):
+        self.run_plan({"a.txt": self.BASE.decode()})
+        self.edit("a.txt", b"LINE 1\nline 2\nline 3\n")
+        actions, counts = self.run_plan({"a.txt": "line 1\nline 2\nline 3!\n"}, merge=True)
+        self.assertEqual(actions, {"a.txt": "merged"})
+        self.assertEqual(counts["merged"], 1)
+        self.assertEqual(self.backend.files["a.txt"], b"LINE 1\nline 2\nline 3!\n")
+        # The merge result counts as edited, so the next change merges against the new base
+        actions, _ = self.run_plan({"a.txt": "line 1\nline 2\nline 3?\n"}, merge=True)
+        self.assertEqual(actions, {"a.txt": "merged"})
+        self.assertEqual(self.backend.files["a.txt"], b"LINE 1\nline 2\nline 3?\n")
+
+    def test_merge_conflict_leaves_the_file_alone(self):
+        self.run_plan({"a.txt": self.BASE.decode()})
+        edited = b"line 1\nmine\nline 3\n"
+        self.edit("a.txt", edited)
+        actions, counts = self.run_plan({"a.txt": "line 1\ntheirs\nline 3\n"}, merge=True)
+        self.assertEqual(actions, {"a.txt": "conflict"})
+        self.assertEqual(counts["conflict"], 1)
+        self.assertEqual(self.backend.files["a.txt"], edited)
+
+    def test_existing_file_never_generated_is_unmanaged(self):
+        self.backend.write("a.txt", b"theirs\n")
+        actions, counts = self.run_plan({"a.txt": "ours\n"})
+        self.assertEqual(actions, {"a.txt": "unmanaged"})
+        self.assertEqual(counts["unmanaged"], 1)
+        self.assertEqual(self.backend.files["a.txt"], b"theirs\n")
+
+    def test_identical_file_never_generated_is_adopted(self):
+        self.backend.write("a.txt", b"same\n")
+        self.run_plan({"a.txt": "same\n"})
+        self.edit("a.txt", b"mine\n")
+        actions, _ = self.run_plan({"a.txt": "new\n"})
+        self.assertEqual(actions, {"a.txt": "modified"})
+
+
+class ArchiveTests(unittest.TestCase):
+    def setUp(self):
+        plan = ScaffoldPlan()
+        plan.add_directory("empty")
+        plan.add_file("README.md", "# Treasure Hunter\n")
+        plan.add_file("src/app.js", "export default {};\n")
+        self.compiled = plan.compile()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def archive_file(self, name, archive_format):
+        path = os.path.join(self.directory.name, name)
+        write_archive(self.compiled, path, archive_format)
+        with open(path, "rb") as f:
+            return f.read()
+
+    def archive_stdout(self, archive_format):
+        stdout = io.TextIOWrapper(io.BytesIO())
+        with mock.patch.object(sys, "stdout", stdout):
+            write_archive(self.compiled, "-", archive_format)
+        stdout.flush()
+        return stdout.buffer.getvalue()
+
+    def check_reproducible(self, archive_format):
+        first = self.archive_file(f"first.{archive_format}", archive_format)
+        self.assertTrue(first)
+        self.assertEqual(self.archive_file(f"second.{archive_format}", archive_format), first)
+        self.assertEqual(self.archive_stdout(archive_format), first)
+
+    def test_tar_gz_is_byte_identical(self):
+        self.check_reproducible("tar.gz")
+
+    def test_zip_is_byte_identical(self):
+        self.check_reproducible("zip")
+
+
+if __name__ == "__main__":
+    unittest.main()
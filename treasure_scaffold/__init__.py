@@ -0,0 +1,51 @@
+"""Scaffolding for the Treasure Hunter app.
+
+A ScaffoldPlan lists directories and templated files. It is compiled once
+and then executed through a storage backend: DiskBackend, MemoryBackend or
+ArchiveBackend. set-up.py and ``python -m treasure_scaffold`` are thin
+wrappers around cli.main().
+
+Submodules are imported the first time one of their names is used, so
+importing the package itself is nearly free.
+"""
+import importlib
+
+_EXPORTS = {
+    "aio": ["BlockingIO", "create_many_structures_async", "create_treasure_hunter_structure_async",
+            "execute_plan_async"],
+    "archive": ["ARCHIVE_FORMATS", "ArchiveBackend", "archive_format_for", "write_archive"],
+    "assets": ["ASSET_DIR", "COPY_METHODS", "AssetSeeder", "seed_assets"],
+    "backends": ["DURABILITY_MODES", "LINK_MODES", "ContentStore", "DiskBackend", "FileStat", "MemoryBackend"],
+    "cli": ["main", "parse_args"],
+    "dataset": ["ENTITIES", "generate_chunk", "write_dataset"],
+    "engine": ["PlannedChange", "classify_file", "execute_plan", "format_plan", "plan_changes"],
+    "groups": ["GROUPS", "build_treasure_hunter_plan", "resolve_groups"],
+    "loadgen": ["SCENARIOS", "ConnectionPool", "LatencyHistogram", "LoadResult", "load_endpoints",
+                "parse_endpoints", "parse_mix", "run_load", "serve_stub"],
+    "manifest": ["BASES_PATH", "MANIFEST_PATH", "load_bases", "load_manifest", "save_bases", "save_manifest"],
+    "merge": ["merge3"],
+    "plan": ["CompiledPlan", "PlanFile", "ScaffoldPlan", "file_payload"],
+    "project": ["ScaffoldOptions", "create_many_structures", "create_treasure_hunter_structure"],
+    "rendercache": ["RENDER_CACHE_SIZE", "RenderCache", "scaffolder_version"],
+    "report": ["REPORT_MODES", "PhaseStats", "Reporter", "merge_totals"],
+    "templates": ["DEFAULT_VARIABLES", "TEMPLATE_DIR", "TEMPLATE_PACK", "DirectoryTemplates", "TemplateBundle",
+                  "TemplateRenderer", "compile_template", "default_renderer", "freeze_variables",
+                  "load_templates", "pack_templates", "read_variables", "template_variables"],
+    "watch": ["affected_files", "watch"],
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULE_OF)
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
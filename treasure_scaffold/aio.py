@@ -0,0 +1,170 @@
+"""asyncio execution of compiled plans, for services scaffolding many workspaces"""
+import asyncio
+import functools
+
+from .engine import _batches, _materialize, _record_batch, _render_batch, _save_state, _state_changed, _unplanned
+from .manifest import load_bases, load_manifest
+from .plan import file_payload
+from .project import _TARGET_SUMMARIES, ScaffoldOptions, _compile_plan, _finish, _open_backend
+from .report import Reporter, merge_totals
+
+
+class BlockingIO:
+    """Runs blocking filesystem calls on a bounded thread pool.
+
+    At most max_workers calls run at once and at most max_pending are
+    queued or running; producers awaiting acquire() beyond that are
+    suspended, so a large plan never turns into a large backlog of
+    futures. One instance can be shared by every workspace in a loop to
+    bound the I/O of all of them together.
+    """
+
+    def __init__(self, max_workers=8, max_pending=None):
+        from concurrent.futures import ThreadPoolExecutor
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scaffold-io")
+        self._slots = asyncio.Semaphore(max_pending or max_workers * 4)
+
+    async def acquire(self):
+        """Wait for room for one more call"""
+        await self._slots.acquire()
+
+    def submit(self, func, *args):
+        """Start func(*args) in an already acquired slot; the slot is freed when it finishes"""
+        future = asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args))
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def call(self, func, *args):
+        """Run func(*args) on the pool and return its result"""
+        await self.acquire()
+        return await self.submit(func, *args)
+
+    def close(self):
+        """Stop the worker threads once queued calls have finished"""
+        self._executor.shutdown(wait=True)
+
+
+async def _mkdir_level(io, backend, reporter, directories):
+    """Create directories that do not depend on each other"""
+    created = await asyncio.gather(*[io.call(backend.mkdir, directory) for directory in directories])
+    for directory, new in zip(directories, created):
+        if new:
+            reporter.directory_created(backend, directory)
+
+
+async def execute_plan_async(compiled, backend, io, manifest=True, reporter=None, merge=False):
+    """Awaitable counterpart of execute_plan(), with the same results.
+
+    Every blocking backend call goes through io, a BlockingIO. Directories
+    are created a depth level at a time, so siblings are created together
+    while parents still come first. Files are submitted as slots free up,
+    a batch at a time as in execute_plan(), and reported in plan order.
+    Each batch is rendered through io as well: templates are read from
+    disk the first time they are used, and a RenderCache reads and writes
+    its own files.
+    Backends that are not concurrent, such as an ArchiveBackend, are
+    driven one call at a time in plan order.
+    Closing the backend is up to the caller.
+    """
+    if reporter is None:
+        reporter = Reporter()
+    if backend.concurrent:
+        levels = {}
+        for directory in compiled.directories:
+            levels.setdefault(directory.count("/"), []).append(directory)
+        with reporter.phase("directories", backend):
+            for depth in sorted(levels):
+                await _mkdir_level(io, backend, reporter, levels[depth])
+    else:
+        with reporter.phase("directories", backend):
+            for directory in compiled.directories:
+                if await io.call(backend.mkdir, directory):
+                    reporter.directory_created(backend, directory)
+
+    with reporter.phase("manifest", backend):
+        previous = await io.call(load_manifest, backend) if manifest else {}
+        bases = await io.call(load_bases, backend) if manifest and merge else None
+    current = _unplanned(previous, compiled.files)
+    materialize = functools.partial(_materialize, backend, bases=bases)
+    for batch in _batches(compiled.files):
+        with reporter.phase("render", backend):
+            paths = [entry.path for entry in batch]
+            payloads = await io.call(_render_batch, compiled, batch)
+            records = [previous.get(path) for path in paths]
+        with reporter.phase("files", backend):
+            if backend.concurrent:
+                futures = []
+                for args in zip(paths, payloads, records):
+                    await io.acquire()
+                    futures.append(io.submit(materialize, *args))
+                results = await asyncio.gather(*futures)
+            else:
+                results = [await io.call(materialize, *args) for args in zip(paths, payloads, records)]
+            _record_batch(reporter, backend, current, paths, payloads, results)
+    if manifest and _state_changed(backend, previous, current):
+        with reporter.phase("manifest", backend):
+            payloads = (file_payload(compiled, entry) for entry in compiled.files)
+            await io.call(_save_state, backend, current, payloads, bases)
+
+
+async def _scaffold_async(compiled, target, io, options, summary=True, hooks=()):
+    """Scaffold one destination from a compiled plan; returns its totals.
+
+    The counterpart of project._scaffold_one, with every blocking call made through io.
+    """
+    reporter = Reporter(options.report, hooks=hooks, target=target)
+    backend = await io.call(_open_backend, target, options)
+    try:
+        await execute_plan_async(compiled, backend, io, manifest=options.manifest, reporter=reporter,
+                                 merge=options.merge)
+    finally:
+        with reporter.phase("commit", backend):
+            await io.call(backend.close)
+    return _finish(reporter, target, summary)
+
+
+async def create_treasure_hunter_structure_async(base_path, io=None, options=None, hooks=(), **overrides):
+    """Scaffold the Treasure Hunter app into base_path from a running event loop.
+
+    Pass a shared BlockingIO as io to bound the filesystem work of every
+    scaffold in the loop together; otherwise a private one is used for
+    this call. options and keyword arguments are as for
+    create_treasure_hunter_structure(), except that reporting is quiet
+    unless asked for. Each of hooks is called on the loop with a
+    PhaseStats as each phase ends. Returns the Reporter totals for the run.
+    """
+    options = (options or ScaffoldOptions(report="quiet"))._replace(**overrides)
+    owned = io is None
+    io = io or BlockingIO()
+    try:
+        compiled = await io.call(_compile_plan, options)
+        return await _scaffold_async(compiled, base_path, io, options, hooks=hooks)
+    finally:
+        if owned:
+            io.close()
+
+
+async def create_many_structures_async(targets, io=None, options=None, hooks=(), **overrides):
+    """Scaffold several destinations concurrently in the running event loop.
+
+    The plan is compiled once and every target shares io, so the number
+    of filesystem calls in flight stays bounded however many targets are
+    given. As with create_many_structures(), only the verbose and jsonl
+    report modes give a summary per target; the merged totals are returned.
+    hooks get the PhaseStats of every target, as its phases end.
+    """
+    options = (options or ScaffoldOptions(report="quiet"))._replace(**overrides)
+    owned = io is None
+    io = io or BlockingIO()
+    try:
+        compiled = await io.call(_compile_plan, options)
+        all_totals = await asyncio.gather(*[
+            _scaffold_async(compiled, target, io, options, summary=options.report in _TARGET_SUMMARIES,
+                            hooks=hooks)
+            for target in targets
+        ])
+    finally:
+        if owned:
+            io.close()
+    return merge_totals(all_totals)
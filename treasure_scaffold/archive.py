@@ -0,0 +1,170 @@
+"""Streaming, reproducible tar.gz and zip output"""
+import collections
+import io
+import os
+import sys
+
+from .backends import FileStat
+from .constants import ARCHIVE_FORMATS
+from .engine import execute_plan
+from .paths import _normalize
+from .report import Reporter
+
+
+# Fixed timestamp for archive entries so identical plans produce identical
+# bytes; 1980-01-01 is the earliest date a zip entry can carry.
+ARCHIVE_EPOCH = 315532800
+
+
+def archive_format_for(path):
+    """Guess the archive format from an output file name"""
+    name = path.lower()
+    if name.endswith((".tar.gz", ".tgz")):
+        return "tar.gz"
+    if name.endswith(".zip"):
+        return "zip"
+    raise ValueError(f"Cannot infer archive format from {path!r}; pass --archive-format")
+
+
+def _archive_epoch():
+    """Entry timestamp, overridable through SOURCE_DATE_EPOCH"""
+    return max(int(os.environ.get("SOURCE_DATE_EPOCH", ARCHIVE_EPOCH)), ARCHIVE_EPOCH)
+
+
+class _ForwardOnly:
+    """Hide seek/tell so zipfile always uses its streaming layout"""
+
+    def __init__(self, stream):
+        self.write = stream.write
+        self.flush = stream.flush
+
+
+class ArchiveBackend:
+    """Streams every directory and file straight into a tar.gz or zip.
+
+    output is a file path, '-' for stdout, or a binary file object. Entries
+    are appended in the order they are created, with fixed owners, modes and
+    timestamps, so the same plan always yields a byte-identical archive. The
+    zip is always laid out as if the output were a pipe, so a file and
+    stdout receive the same bytes. prefix, if given, becomes the top-level
+    folder inside the archive. Nothing can be read back, so every path
+    looks new.
+    """
+
+    # Entries must reach the archive in plan order
+    concurrent = False
+
+    def __init__(self, output, archive_format=None, prefix=""):
+        if archive_format is None:
+            archive_format = archive_format_for(output)
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unsupported archive format: {archive_format}")
+        self.output = output
+        self.syscalls = collections.Counter()
+        self.epoch = _archive_epoch()
+        self.prefix = f"{_normalize(prefix)}/" if prefix else ""
+
+        if output == "-":
+            self._stream, self._owned = sys.stdout.buffer, False
+        elif isinstance(output, str):
+            self._stream, self._owned = open(output, 'wb'), True
+        else:
+            self._stream, self._owned = output, False
+
+        if archive_format == "tar.gz":
+            self._open_tar_gz()
+        else:
+            self._open_zip()
+        if self.prefix:
+            self._add_directory(self.prefix[:-1])
+
+    def _open_tar_gz(self):
+        import gzip
+        import tarfile
+        self._tarfile = tarfile
+        self._gzip = gzip.GzipFile(filename="", mode="wb", fileobj=self._stream, mtime=self.epoch)
+        self._archive = tarfile.open(fileobj=self._gzip, mode="w|", format=tarfile.PAX_FORMAT)
+        self._add_directory = self._tar_directory
+        self._add_file = self._tar_file
+
+    def _tar_directory(self, name):
+        info = self._tarfile.TarInfo(name)
+        info.type = self._tarfile.DIRTYPE
+        info.mode = 0o755
+        info.mtime = self.epoch
+        self._archive.addfile(info)
+
+    def _tar_file(self, name, data):
+        info = self._tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mode = 0o644
+        info.mtime = self.epoch
+        self._archive.addfile(info, io.BytesIO(data))
+
+    def _open_zip(self):
+        import time
+        import zipfile
+        self._zipfile = zipfile
+        self._gzip = None
+        self._date_time = time.gmtime(self.epoch)[:6]
+        self._archive = zipfile.ZipFile(_ForwardOnly(self._stream), mode="w",
+                                        compression=zipfile.ZIP_DEFLATED)
+        self._add_directory = self._zip_directory
+        self._add_file = self._zip_file
+
+    def _zip_directory(self, name):
+        info = self._zipfile.ZipInfo(f"{name}/", self._date_time)
+        info.external_attr = (0o40755 << 16) | 0x10
+        self._archive.writestr(info, b"")
+
+    def _zip_file(self, name, data):
+        info = self._zipfile.ZipInfo(name, self._date_time)
+        info.external_attr = 0o100644 << 16
+        info.compress_type = self._zipfile.ZIP_DEFLATED
+        self._archive.writestr(info, data)
+
+    def describe(self, path):
+        return f"{self.output}:{self.prefix}{path}"
+
+    def exists(self, path):
+        return False
+
+    def mkdir(self, path):
+        self._add_directory(self.prefix + path)
+        return True
+
+    def stat(self, path):
+        return None
+
+    def read(self, path):
+        return None
+
+    def write(self, path, data, overwrite=False):
+        self._add_file(self.prefix + path, data)
+        return FileStat(len(data), self.epoch * 10**9)
+
+    def replace(self, path, data):
+        self.write(path, data, overwrite=True)
+
+    def close(self):
+        self._archive.close()
+        if self._gzip is not None:
+            self._gzip.close()
+        if self._owned:
+            self._stream.close()
+        else:
+            self._stream.flush()
+
+
+def write_archive(compiled, output, archive_format=None, prefix="", report="quiet"):
+    """Write a compiled plan straight into a tar.gz or zip archive.
+
+    Progress is reported on stderr when the archive itself goes to stdout.
+    """
+    reporter = Reporter(report, stream=sys.stderr if output == "-" else None, target=output)
+    backend = ArchiveBackend(output, archive_format, prefix)
+    try:
+        execute_plan(compiled, backend, manifest=False, reporter=reporter)
+    finally:
+        backend.close()
+    reporter.finish(output if isinstance(output, str) else "archive")
@@ -0,0 +1,196 @@
+"""Seeding src/assets from a local asset cache with in-kernel copies"""
+import collections
+import errno
+import hashlib
+import os
+import threading
+import time
+
+from .backends import FICLONE, TEMP_SUFFIX
+from .paths import _native_path, _normalize, _path_key
+
+# Where seeded assets go in a workspace; the cache mirrors its layout (fonts/, images/, animations/)
+ASSET_DIR = "src/assets"
+ASSET_WORKERS = 8
+# Copy methods in the order they are tried
+COPY_METHODS = ("reflink", "copy_file_range", "sendfile", "read/write")
+_HASH_BLOCK = 1 << 20
+
+
+def _file_digest(path):
+    """sha256 hex digest of a file, read in large blocks"""
+    digest = hashlib.sha256()
+    buffer = bytearray(_HASH_BLOCK)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+    return digest.hexdigest()
+
+
+class AssetSeeder:
+    """Copies every file under cache into the src/assets of workspaces.
+
+    Each file is copied with the cheapest method the filesystems allow:
+    a reflink (a copy-on-write clone sharing the cache's blocks), then
+    copy_file_range() and sendfile(), which copy inside the kernel, and
+    finally plain reads and writes. A method the filesystem turns down for
+    a reason other than crossing devices is not tried again. Files are
+    copied to a temporary name and renamed, on a pool of worker threads.
+
+    A destination file with the same size and sha256 as its cached copy
+    is left alone. Digests of cache files are remembered while their size
+    and mtime stay the same, so seeding many workspaces hashes the cache
+    once.
+    """
+
+    def __init__(self, cache, workers=ASSET_WORKERS):
+        if not os.path.isdir(cache):
+            raise ValueError(f"Asset cache {cache} is not a directory")
+        self.cache = cache
+        self.workers = workers
+        self._enabled = {method: True for method in COPY_METHODS}
+        self._enabled["copy_file_range"] = hasattr(os, "copy_file_range")
+        self._enabled["sendfile"] = hasattr(os, "sendfile")
+        self._digests = {}
+        self._lock = threading.Lock()
+        self._files = None
+
+    def files(self):
+        """(relative path, size) of every cached asset, scanned once"""
+        if self._files is None:
+            files = []
+            for folder, _, names in os.walk(self.cache):
+                for name in names:
+                    if name.startswith(".") or name.endswith(TEMP_SUFFIX):
+                        continue
+                    path = os.path.join(folder, name)
+                    files.append((_normalize(os.path.relpath(path, self.cache)), os.stat(path).st_size))
+            self._files = sorted(files, key=lambda item: _path_key(item[0]))
+        return self._files
+
+    def _cache_digest(self, path):
+        stat = os.stat(path)
+        key = (stat.st_size, stat.st_mtime_ns)
+        known = self._digests.get(path)
+        if known is not None and known[0] == key:
+            return known[1]
+        digest = _file_digest(path)
+        with self._lock:
+            self._digests[path] = (key, digest)
+        return digest
+
+    def _unchanged(self, source, destination, size):
+        """Whether destination already holds the same bytes as source"""
+        try:
+            if os.stat(destination).st_size != size:
+                return False
+        except FileNotFoundError:
+            return False
+        return _file_digest(destination) == self._cache_digest(source)
+
+    def _disable(self, method, error):
+        """Stop trying method unless error only concerns this pair of devices"""
+        if error.errno != errno.EXDEV:
+            self._enabled[method] = False
+
+    def _copy(self, source, destination, size):
+        """Copy source to destination; returns the method that worked"""
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            src_fd, dst_fd = src.fileno(), dst.fileno()
+            if self._enabled["reflink"]:
+                try:
+                    import fcntl
+                    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                    return "reflink"
+                except ImportError:
+                    self._enabled["reflink"] = False
+                except OSError as error:
+                    self._disable("reflink", error)
+            for method in ("copy_file_range", "sendfile"):
+                if not self._enabled[method]:
+                    continue
+                offset = 0
+                try:
+                    while offset < size:
+                        if method == "copy_file_range":
+                            sent = os.copy_file_range(src_fd, dst_fd, size - offset, offset, offset)
+                        else:
+                            sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                        if not sent:
+                            break
+                        offset += sent
+                except OSError as error:
+                    if error.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                                           errno.ENOTSUP, errno.EBADF):
+                        raise
+                    self._disable(method, error)
+                else:
+                    if offset == size:
+                        return method
+                # Start over with the next method
+                os.ftruncate(dst_fd, 0)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+            src.seek(0)
+            while True:
+                block = src.read(_HASH_BLOCK)
+                if not block:
+                    break
+                dst.write(block)
+            return "read/write"
+
+    def _seed_file(self, base_path, relative, size):
+        """Bring one asset up to date; returns what was done"""
+        source = _native_path(self.cache, relative)
+        destination = _native_path(base_path, f"{ASSET_DIR}/{relative}")
+        if self._unchanged(source, destination, size):
+            return "unchanged"
+        temp_path = f"{destination}.{threading.get_ident()}{TEMP_SUFFIX}"
+        try:
+            method = self._copy(source, temp_path, size)
+            os.replace(temp_path, destination)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return method
+
+    def seed(self, base_path):
+        """Copy the cache into base_path's src/assets; returns counts by method, bytes and elapsed_ms"""
+        start = time.perf_counter()
+        files = self.files()
+        folders = {os.path.dirname(relative) for relative, _ in files}
+        for folder in sorted(folders, key=_path_key):
+            os.makedirs(_native_path(base_path, f"{ASSET_DIR}/{folder}" if folder else ASSET_DIR), exist_ok=True)
+        totals = collections.Counter()
+        if self.workers > 1 and len(files) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asset-copy") as pool:
+                results = list(pool.map(lambda item: self._seed_file(base_path, *item), files))
+        else:
+            results = [self._seed_file(base_path, relative, size) for relative, size in files]
+        for (_, size), result in zip(files, results):
+            totals[result] += 1
+            if result != "unchanged":
+                totals["bytes"] += size
+        totals["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return dict(totals)
+
+
+def seed_assets(cache, base_path, workers=ASSET_WORKERS):
+    """Copy the asset cache into base_path's src/assets; see AssetSeeder"""
+    return AssetSeeder(cache, workers).seed(base_path)
+
+
+def format_seed(target, totals):
+    """One summary line for an AssetSeeder.seed() result"""
+    copied = sum(totals.get(method, 0) for method in COPY_METHODS)
+    methods = ", ".join(f"{method} {totals[method]}" for method in COPY_METHODS if totals.get(method))
+    return (f"{target}: {copied} assets copied" + (f" ({methods})" if methods else "")
+            + f", {totals.get('unchanged', 0)} unchanged, {totals.get('bytes', 0)} bytes"
+            f" in {totals['elapsed_ms']:.1f} ms")
@@ -0,0 +1,503 @@
+"""Storage backends that a compiled plan is executed through"""
+import collections
+import errno
+import os
+import threading
+from collections import namedtuple
+
+from .constants import DURABILITY_MODES, LINK_MODES, MANIFEST_PATH
+from .manifest import _digest
+from .paths import _native_path
+
+
+# linked: the file shares its inode with a ContentStore object (and so with other workspaces)
+FileStat = namedtuple("FileStat", ["size", "mtime_ns", "linked"], defaults=(False,))
+
+
+# Suffix of the temporary files that writes go through before being renamed
+TEMP_SUFFIX = ".th-tmp"
+# Threads flushing staged files when a batch-mode backend is closed
+FSYNC_WORKERS = 8
+
+# Linux ioctl that shares a source file's extents with a destination file
+FICLONE = 0x40049409
+# Store objects are read-only, so a hard-linked workspace file cannot be edited in place
+_OBJECT_MODE = 0o444
+
+
+class ContentStore:
+    """Content-addressed store of generated files shared between workspaces.
+
+    Each distinct file body is written once to objects/<sha256[:2]>/<rest>
+    under root and then linked into every workspace that needs it:
+
+    - "reflink" (the default): a copy-on-write clone (btrfs, XFS,
+      APFS-style filesystems); workspaces share blocks until one of them is
+      edited, and each file is writable on its own.
+    - "hardlink": every workspace shares one inode. Cheapest, but an editor
+      that saves in place would change the file in every workspace at
+      once, and the stored object with it. Objects are therefore stored
+      read-only, so such a save fails instead of spreading; editors that
+      save through a new file simply break the link.
+
+    An object is only reused once it has been checked: the first time a
+    run needs it, it is hashed, and afterwards its size, mtime and inode
+    must still match. An object that no longer holds its body is stored
+    again under a new inode, leaving the edited workspace its copy.
+
+    A link that the filesystem refuses (another device, link limit reached,
+    no reflink support) falls back to writing a plain copy. Keep root on
+    the same filesystem as the workspaces or every file will be copied.
+    """
+
+    def __init__(self, root, link="reflink"):
+        if link not in LINK_MODES:
+            raise ValueError(f"Unknown link mode: {link}")
+        self.root = root
+        self.link = link
+        # digest -> (size, mtime_ns, inode) of objects checked to hold their body
+        self._verified = {}
+        self._lock = threading.Lock()
+        # Cleared after the filesystem first turns down a reflink, to stop retrying
+        self._reflinks = True
+
+    def object_path(self, digest):
+        """Where the body hashing to digest lives in the store"""
+        return os.path.join(self.root, "objects", digest[:2], digest[2:])
+
+    def _intact(self, digest, path, stat):
+        """Whether the object at path, with stat, still holds the body hashing to digest"""
+        key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        if self._verified.get(digest) == key:
+            return True
+        with open(path, 'rb') as f:
+            if _digest(f.read()) != digest:
+                return False
+        with self._lock:
+            self._verified[digest] = key
+        return True
+
+    def put(self, data, durable=False):
+        """Store data unless an intact copy is there already and return its object path"""
+        digest = _digest(data)
+        path = self.object_path(digest)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stat = None
+        if stat is not None and stat.st_size == len(data) and self._intact(digest, path, stat):
+            if stat.st_mode & 0o222:
+                # Stored before objects were made read-only
+                os.chmod(path, _OBJECT_MODE)
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{TEMP_SUFFIX}"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            os.fchmod(f.fileno(), _OBJECT_MODE)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        if stat is not None:
+            # Edited in place through a link in some workspace; that workspace keeps
+            # the edited inode and the store gets the generated body back
+            os.replace(temp_path, path)
+        else:
+            # Link rather than rename so that when workers race, the first object stays
+            # and files already linked to it keep sharing it
+            try:
+                os.link(temp_path, path)
+            except FileExistsError:
+                os.unlink(temp_path)
+            except OSError:
+                # No hard links on this filesystem; every body is copied out anyway
+                os.replace(temp_path, path)
+            else:
+                os.unlink(temp_path)
+        return path
+
+    def materialize(self, data, destination, durable=False):
+        """Link the stored copy of data to destination; False if it must be copied instead"""
+        if self.link == "hardlink":
+            source = self.put(data, durable)
+            try:
+                os.link(source, destination)
+            except OSError:
+                return False
+            return True
+        if not self._reflinks:
+            return False
+        try:
+            import fcntl
+        except ImportError:
+            self._reflinks = False
+            return False
+        source = self.put(data, durable)
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return True
+            except OSError as error:
+                if error.errno != errno.EXDEV:
+                    self._reflinks = False
+        os.unlink(destination)
+        return False
+
+
+def _process_gone(pid):
+    """Whether no process with this id is running; False where that cannot be told"""
+    if os.name != "posix" or pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+class DiskBackend:
+    """Writes the scaffold into a directory on the real filesystem.
+
+    Every backend takes '/'-separated plan paths relative to its root and
+    offers the same small set of operations: mkdir, stat, read, write and
+    replace. write() raises FileExistsError unless overwrite is set.
+
+    Files are written to a temporary name beside the target and renamed
+    into place, so an interrupted run never leaves a truncated file behind.
+    New files are hard-linked into place rather than renamed, so a file
+    that appears meanwhile is never overwritten.
+    durability chooses how much survives a power loss:
+
+    - "none": rename only; the OS flushes in its own time.
+    - "file": fsync every file and its directory as it is written.
+    - "batch": stage every file under its temporary name, fsync them all
+      from a small thread pool when the backend is closed, then rename
+      them and fsync each touched directory a single time. A new file that someone else
+      creates before then is left as they wrote it.
+
+    Existence checks are answered from a snapshot of the destination: each
+    directory is listed with a single os.scandir the first time it is
+    needed, directories created during the run start out as empty
+    listings, and every mkdir and write updates the snapshot. Temporary
+    files that a killed run left behind are removed as a directory is
+    listed. Pass
+    snapshot=False if something else modifies the tree during the run.
+
+    With a ContentStore, file bodies are linked in from the store instead
+    of being written out again for every workspace.
+
+    syscalls counts the system calls issued through the backend, by name.
+    """
+
+    # Whether write() may be called from several threads at once
+    concurrent = True
+
+    def __init__(self, base_path, durability="none", snapshot=True, store=None):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
+        self.base_path = base_path
+        self.durability = durability
+        self.snapshot = snapshot
+        self.store = store
+        self._listings = {}
+        # Held while a listing is built or the snapshot is extended; re-entrant as
+        # listing a directory first lists its parent
+        self._snapshot_lock = threading.RLock()
+        self._staged = []
+        self._dirty_directories = set()
+        self.syscalls = collections.Counter()
+        self._syscalls_lock = threading.Lock()
+
+    def _count(self, *names):
+        """Record system calls about to be issued"""
+        with self._syscalls_lock:
+            self.syscalls.update(names)
+
+    def _listing(self, directory):
+        """Names inside a plan directory ("" is the root), listed once"""
+        names = self._listings.get(directory)
+        if names is not None:
+            return names
+        with self._snapshot_lock:
+            # Another thread may have listed it while this one waited
+            names = self._listings.get(directory)
+            if names is not None:
+                return names
+            parent, _, name = directory.rpartition("/")
+            if directory and name not in self._listing(parent):
+                names = set()
+            else:
+                self._count("scandir")
+                try:
+                    with os.scandir(_native_path(self.base_path, directory)) as entries:
+                        names = {entry.name for entry in entries}
+                except (FileNotFoundError, NotADirectoryError):
+                    names = set()
+                names -= self._sweep(directory, names)
+            self._listings[directory] = names
+            return names
+
+    def _sweep(self, directory, names):
+        """Remove temporary files of runs that are no longer alive; returns the names removed"""
+        removed = set()
+        for name in names:
+            if not (name.startswith(".") and name.endswith(TEMP_SUFFIX)):
+                continue
+            pid = name[:-len(TEMP_SUFFIX)].rpartition(".")[2]
+            if not pid.isdigit() or not _process_gone(int(pid)):
+                continue
+            self._count("unlink")
+            try:
+                os.unlink(_native_path(self.base_path, f"{directory}/{name}" if directory else name))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            removed.add(name)
+        return removed
+
+    def exists(self, path):
+        """Whether anything exists at path"""
+        if not self.snapshot:
+            self._count("lstat")
+            return os.path.lexists(_native_path(self.base_path, path))
+        parent, _, name = path.rpartition("/")
+        return name in self._listing(parent)
+
+    def _record(self, path, is_directory=False):
+        """Add a path created during the run to the snapshot"""
+        if self.snapshot:
+            parent, _, name = path.rpartition("/")
+            with self._snapshot_lock:
+                self._listing(parent).add(name)
+                if is_directory:
+                    self._listings[path] = set()
+
+    def describe(self, path):
+        """Human readable location of path, used in progress output"""
+        return _native_path(self.base_path, path)
+
+    def mkdir(self, path):
+        """Create one directory whose parent exists; False if it already exists"""
+        if self.snapshot and self.exists(path):
+            return False
+        target = _native_path(self.base_path, path)
+        self._count("mkdir")
+        try:
+            os.mkdir(target)
+        except FileExistsError:
+            self._record(path)
+            return False
+        self._record(path, is_directory=True)
+        self._directory_changed(os.path.dirname(target))
+        return True
+
+    def stat(self, path):
+        """Size and mtime of a file, or None if it does not exist"""
+        if self.snapshot and not self.exists(path):
+            return None
+        self._count("stat")
+        try:
+            stat = os.stat(_native_path(self.base_path, path))
+        except FileNotFoundError:
+            return None
+        return FileStat(stat.st_size, stat.st_mtime_ns)
+
+    def read(self, path):
+        """Contents of a file, or None if it does not exist"""
+        if self.snapshot and not self.exists(path):
+            return None
+        self._count("open", "read", "close")
+        try:
+            with open(_native_path(self.base_path, path), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write(self, path, data, overwrite=False):
+        """Write a file through a temporary name and return its FileStat"""
+        target = _native_path(self.base_path, path)
+        if not overwrite and self.exists(path):
+            raise FileExistsError(target)
+        directory, name = os.path.split(target)
+        temp_path = os.path.join(directory, f".{name}.{os.getpid()}{TEMP_SUFFIX}")
+        # The manifest differs in every workspace, so it is never worth storing
+        linked = False
+        if self.store is not None and path != MANIFEST_PATH and self._link_from_store(data, temp_path):
+            self._count("stat")
+            stat = os.stat(temp_path)
+            linked = self.store.link == "hardlink"
+        else:
+            self._count("open", "write", "fstat", "close")
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                if self.durability == "file":
+                    self._count("fsync")
+                    os.fsync(f.fileno())
+                stat = os.fstat(f.fileno())
+
+        if self.durability == "batch":
+            self._staged.append((temp_path, target, overwrite))
+        else:
+            try:
+                self._publish(temp_path, target, overwrite)
+            except FileExistsError:
+                self._record(path)
+                raise
+            self._directory_changed(directory)
+        self._record(path)
+        return FileStat(stat.st_size, stat.st_mtime_ns, linked)
+
+    def _publish(self, temp_path, target, overwrite):
+        """Move a written temporary file to target; FileExistsError if target exists and overwrite is unset.
+
+        os.replace would silently clobber a file created since the snapshot
+        was taken, so a new file is linked into place instead, which fails
+        atomically if anything is already there.
+        """
+        if overwrite:
+            self._count("rename")
+            os.replace(temp_path, target)
+            return
+        self._count("link", "unlink")
+        try:
+            os.link(temp_path, target)
+        except FileExistsError:
+            os.unlink(temp_path)
+            raise
+        except OSError:
+            # No hard links here; claim the name exclusively, then rename over the claim
+            self._count("open", "close", "rename")
+            try:
+                os.close(os.open(target, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                os.unlink(temp_path)
+                raise
+            os.replace(temp_path, target)
+            return
+        os.unlink(temp_path)
+
+    def replace(self, path, data):
+        """Atomically replace a file so readers never see a partial write"""
+        self.write(path, data, overwrite=True)
+
+    def _link_from_store(self, data, temp_path):
+        """Link data from the content store to temp_path; False to write it instead"""
+        self._count("link" if self.store.link == "hardlink" else "ioctl")
+        return self.store.materialize(data, temp_path, durable=self.durability == "file")
+
+    def _directory_changed(self, directory):
+        """Make a new directory entry durable according to the mode"""
+        if self.durability == "file":
+            self._fsync_directory(directory)
+        elif self.durability == "batch":
+            self._dirty_directories.add(directory)
+
+    def close(self):
+        """Commit staged files in batch mode"""
+        if not self._staged and not self._dirty_directories:
+            return
+        if self._staged:
+            # Flushing only what this run wrote, rather than os.sync(), leaves
+            # every other filesystem and process on the machine alone
+            from concurrent.futures import ThreadPoolExecutor
+            workers = min(FSYNC_WORKERS, len(self._staged))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scaffold-fsync") as pool:
+                for _ in pool.map(self._fsync_file, [temp_path for temp_path, _, _ in self._staged]):
+                    pass
+        for temp_path, target, overwrite in self._staged:
+            try:
+                self._publish(temp_path, target, overwrite)
+            except FileExistsError:
+                # Created by someone else since it was staged; theirs stays, and its stat
+                # no longer matches the manifest, so later runs treat it as edited
+                continue
+            self._dirty_directories.add(os.path.dirname(target))
+        for directory in sorted(self._dirty_directories):
+            self._fsync_directory(directory)
+        self._staged = []
+        self._dirty_directories = set()
+
+    def _fsync_file(self, path):
+        """Persist the contents of a written file"""
+        self._count("open", "fsync", "close")
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _fsync_directory(self, directory):
+        """Persist the entries of a directory; a no-op where unsupported"""
+        if os.name != "posix":
+            return
+        self._count("open", "fsync", "close")
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class MemoryBackend:
+    """Keeps the scaffold in dictionaries without touching the disk.
+
+    Modification times come from a counter, so repeated runs are exactly
+    reproducible. Useful for tests and for benchmarking the generator
+    itself.
+    """
+
+    concurrent = True
+
+    def __init__(self):
+        self.directories = set()
+        self.files = {}
+        self.syscalls = collections.Counter()
+        self._mtimes = {}
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def describe(self, path):
+        return path
+
+    def exists(self, path):
+        return path in self.files or path in self.directories
+
+    def mkdir(self, path):
+        if path in self.directories:
+            return False
+        parent = path.rpartition("/")[0]
+        if parent and parent not in self.directories:
+            raise FileNotFoundError(path)
+        self.directories.add(path)
+        return True
+
+    def stat(self, path):
+        data = self.files.get(path)
+        if data is None:
+            return None
+        return FileStat(len(data), self._mtimes[path])
+
+    def read(self, path):
+        return self.files.get(path)
+
+    def write(self, path, data, overwrite=False):
+        parent = path.rpartition("/")[0]
+        if parent and parent not in self.directories:
+            raise FileNotFoundError(path)
+        with self._lock:
+            if not overwrite and path in self.files:
+                raise FileExistsError(path)
+            self._clock += 1
+            self.files[path] = bytes(data)
+            self._mtimes[path] = self._clock
+        return FileStat(len(data), self._clock)
+
+    def replace(self, path, data):
+        self.write(path, data, overwrite=True)
+
+    def close(self):
+        pass
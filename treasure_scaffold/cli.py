@@ -0,0 +1,313 @@
+"""Command line interface, run through set-up.py or python -m treasure_scaffold"""
+import os
+import sys
+
+from .constants import (ARCHIVE_FORMATS, DURABILITY_MODES, IO_LATENCY_MS, LINK_MODES, MANIFEST_PATH,
+                        RENDER_CACHE_SIZE, REPORT_MODES, WATCH_INTERVAL)
+from .groups import GROUPS, build_treasure_hunter_plan, resolve_groups
+from .templates import DEFAULT_VARIABLES, TEMPLATE_DIR, TEMPLATE_PACK, load_templates, pack_templates, read_variables
+
+
+# Tools with options of their own, run as set-up.py NAME ...; each module has a main(argv)
+SUBCOMMANDS = {"dataset": ".dataset", "loadtest": ".loadgen"}
+
+
+def read_targets(path):
+    """Read destination paths from a file, one per line ('-' for stdin)"""
+    stream = sys.stdin if path == "-" else open(path)
+    with stream:
+        lines = [line.strip() for line in stream]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Scaffold the Treasure Hunter app structure",
+        epilog="Run 'set-up.py dataset -h' to generate synthetic data for load tests, "
+               "'set-up.py loadtest -h' to drive load at the API endpoints.",
+    )
+    parser.add_argument(
+        "destinations", nargs="*", metavar="destination",
+        help="directories to scaffold into (default: current directory)",
+    )
+    parser.add_argument(
+        "--targets-file", metavar="FILE",
+        help="read additional destinations from FILE, one per line ('-' for stdin)",
+    )
+    parser.add_argument(
+        "-p", "--processes", type=int, default=None,
+        help="worker processes used when scaffolding several destinations (default: CPU count)",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="number of threads used to write files (default: 1, or 8 shared by all destinations with --async)",
+    )
+    parser.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="scaffold every destination concurrently in one asyncio event loop instead of a process pool",
+    )
+    parser.add_argument(
+        "--archive", metavar="PATH",
+        help="write the scaffold into a tar.gz or zip archive instead of a directory ('-' for stdout)",
+    )
+    parser.add_argument(
+        "--archive-format", choices=ARCHIVE_FORMATS,
+        help="archive format (default: inferred from the --archive file name)",
+    )
+    parser.add_argument(
+        "--archive-prefix", default="", metavar="NAME",
+        help="top-level folder for archive entries (default: none)",
+    )
+    parser.add_argument(
+        "--only", action="append", metavar="GROUP[,GROUP]",
+        help="scaffold only these component groups and their dependencies (see --list-groups)",
+    )
+    parser.add_argument(
+        "--list-groups", action="store_true",
+        help="list the component groups and what they require, then exit",
+    )
+    parser.add_argument(
+        "--var", action="append", default=[], metavar="NAME=VALUE",
+        help=f"override a template variable; one of {', '.join(DEFAULT_VARIABLES)}",
+    )
+    parser.add_argument(
+        "--vars-file", metavar="FILE",
+        help="JSON object of template variables, applied before any --var",
+    )
+    parser.add_argument(
+        "--templates", metavar="PATH",
+        help="template pack or source directory (default: templates.pack if built since templates/ "
+             "last changed, else templates/)",
+    )
+    parser.add_argument(
+        "--pack-templates", nargs="?", const=TEMPLATE_PACK, metavar="OUTPUT",
+        help=f"bundle the template sources into a pack file and exit (default: {TEMPLATE_PACK})",
+    )
+    parser.add_argument(
+        "--fsync", dest="durability", choices=DURABILITY_MODES, default="none",
+        help="durability of written files: none (atomic rename only), file (fsync each file) "
+             "or batch (one flush per run, one fsync per directory); default: none",
+    )
+    parser.add_argument(
+        "--store", metavar="DIR",
+        help="keep one copy of each file body in a content store at DIR and link it into every "
+             "destination; DIR should be on the same filesystem as the destinations",
+    )
+    parser.add_argument(
+        "--link", choices=LINK_MODES, default="reflink",
+        help="how --store files are linked: reflink (copy-on-write clone; each destination's files stay "
+             "independent) or hardlink (one shared, read-only inode per body: saving a file in place fails "
+             "until it is copied, or it would change every destination at once); both fall back to copying; "
+             "default: reflink",
+    )
+    parser.add_argument(
+        "--render-cache", metavar="DIR",
+        help="keep rendered templates in DIR and reuse them in later runs; safe to share between "
+             "concurrent runs, e.g. as a CI cache",
+    )
+    parser.add_argument(
+        "--render-cache-size", type=int, default=RENDER_CACHE_SIZE >> 20, metavar="MB",
+        help=f"evict the least recently used renders once --render-cache holds more than this "
+             f"(default: {RENDER_CACHE_SIZE >> 20})",
+    )
+    parser.add_argument(
+        "--assets", metavar="DIR",
+        help="after scaffolding, copy the fonts, images and animations cached in DIR into each "
+             "destination's src/assets, skipping files that already match",
+    )
+    parser.add_argument(
+        "--report", choices=REPORT_MODES,
+        help="progress output: a line per change (verbose), totals only (summary), "
+             "nothing (quiet) or JSON lines (jsonl); default: verbose, or summary for --archive",
+    )
+    parser.add_argument(
+        "-q", "--quiet", dest="report", action="store_const", const="quiet",
+        help="same as --report quiet",
+    )
+    parser.add_argument(
+        "--profile", metavar="FILE",
+        help="profile the run with cProfile and save the stats to FILE "
+             "(viewable with pstats, snakeviz, or flameprof for a flame graph)",
+    )
+    parser.add_argument(
+        "--plan", action="store_true",
+        help="show what would be created, updated or skipped, with diffs, without writing anything",
+    )
+    parser.add_argument(
+        "--io-latency", type=float, default=IO_LATENCY_MS, metavar="MS",
+        help=f"per-operation latency assumed by --plan's cost estimate (default: {IO_LATENCY_MS})",
+    )
+    parser.add_argument(
+        "--upgrade", action="store_true",
+        help="also bring template changes into files edited since they were generated, with a three-way "
+             "merge against the recorded base content; files where both sides changed the same lines "
+             "are left alone and reported as conflicts",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="after scaffolding, keep polling the template sources and --vars-file and re-render "
+             "only the files a change affects",
+    )
+    parser.add_argument(
+        "--watch-interval", type=float, default=WATCH_INTERVAL, metavar="SECONDS",
+        help=f"how often --watch polls its sources (default: {WATCH_INTERVAL})",
+    )
+    parser.add_argument(
+        "--no-manifest", dest="manifest", action="store_false",
+        help=f"neither read nor write {MANIFEST_PATH}; existing files are never touched",
+    )
+    args = parser.parse_args(argv)
+    if args.jobs is None:
+        args.jobs = 8 if args.use_async else 1
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.processes is not None and args.processes < 1:
+        parser.error("--processes must be at least 1")
+    if args.only:
+        args.only = [name.strip() for value in args.only for name in value.split(",") if name.strip()]
+        try:
+            resolve_groups(args.only)
+        except ValueError as error:
+            parser.error(str(error))
+    try:
+        args.variables = read_variables(args.vars_file, args.var)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    if args.report is None:
+        args.report = "summary" if args.archive else "verbose"
+    if args.render_cache_size < 1:
+        parser.error("--render-cache-size must be at least 1")
+    if args.upgrade and not args.manifest:
+        parser.error("--upgrade needs the manifest; drop --no-manifest")
+    if args.watch and (args.archive or args.plan):
+        parser.error("--watch cannot be combined with --archive or --plan")
+    if args.assets and (args.archive or args.plan):
+        parser.error("--assets cannot be combined with --archive or --plan")
+    if args.assets and not os.path.isdir(args.assets):
+        parser.error(f"--assets: {args.assets} is not a directory")
+    if args.archive:
+        if args.destinations or args.targets_file:
+            parser.error("--archive cannot be combined with destinations")
+        if args.store:
+            parser.error("--store cannot be combined with --archive")
+        if args.archive_format is None:
+            from .archive import archive_format_for
+            try:
+                args.archive_format = archive_format_for(args.archive)
+            except ValueError as error:
+                parser.error(str(error))
+    if args.targets_file:
+        try:
+            args.destinations += read_targets(args.targets_file)
+        except (OSError, ValueError) as error:
+            parser.error(f"--targets-file: {error}")
+    if not args.destinations:
+        args.destinations = [os.getcwd()]
+    return args
+
+
+def seed_destinations(args):
+    """Copy the --assets cache into every destination, reporting each like a scaffold"""
+    import json
+    from .assets import AssetSeeder, format_seed
+    seeder = AssetSeeder(args.assets)
+    for destination in args.destinations:
+        totals = seeder.seed(destination)
+        if args.report == "jsonl":
+            print(json.dumps({"event": "assets", "target": destination, **totals}))
+        elif args.report != "quiet":
+            print(format_seed(destination, totals))
+
+
+def scaffold_options(args, templates, render_cache):
+    """ScaffoldOptions for the parsed command line"""
+    from .project import ScaffoldOptions
+    return ScaffoldOptions(templates=templates, groups=args.only, variables=args.variables,
+                           render_cache=render_cache, jobs=args.jobs, manifest=args.manifest,
+                           durability=args.durability, store=args.store, link=args.link, merge=args.upgrade,
+                           report=args.report)
+
+
+def run(args):
+    """Carry out the action selected on the command line"""
+    # Each action imports what it needs, so e.g. --list-groups never loads the engine
+    templates = load_templates(args.templates) if args.templates else None
+    render_cache = None
+    # A dry run renders in memory, so --plan leaves the cache as it found it
+    if args.render_cache and not args.plan:
+        from .rendercache import RenderCache
+        render_cache = RenderCache(args.render_cache, args.render_cache_size << 20)
+    scaffolds = not (args.list_groups or args.pack_templates or args.plan or args.archive)
+    if args.assets and scaffolds and args.watch:
+        # Assets do not depend on the templates, so seed them before watching starts
+        seed_destinations(args)
+    if args.list_groups:
+        for name, group in GROUPS.items():
+            requires = f" (requires {', '.join(group['requires'])})" if group["requires"] else ""
+            print(f"{name}{requires}")
+    elif args.pack_templates:
+        count = pack_templates(args.templates or TEMPLATE_DIR, args.pack_templates)
+        print(f"Packed {count} templates into {args.pack_templates}")
+    elif args.plan:
+        from .engine import format_plan, plan_changes
+        compiled = build_treasure_hunter_plan(templates, args.only, args.variables).compile()
+        for destination in args.destinations:
+            directories, changes = plan_changes(compiled, destination, manifest=args.manifest, merge=args.upgrade)
+            print(format_plan(destination, directories, changes, args.io_latency))
+    elif args.archive:
+        from .archive import write_archive
+        compiled = build_treasure_hunter_plan(templates, args.only, args.variables, render_cache).compile()
+        write_archive(compiled, args.archive, args.archive_format, args.archive_prefix, args.report)
+    elif args.watch:
+        from .watch import watch
+        watch(args.destinations, args.templates, vars_file=args.vars_file, assignments=args.var,
+              options=scaffold_options(args, templates, render_cache), interval=args.watch_interval)
+    elif args.use_async:
+        import asyncio
+        from .aio import BlockingIO, create_many_structures_async
+        from .report import Reporter
+        reporter = Reporter(args.report)
+        io = BlockingIO(max_workers=args.jobs)
+        try:
+            totals = asyncio.run(create_many_structures_async(
+                args.destinations, io, scaffold_options(args, templates, render_cache)))
+        finally:
+            io.close()
+        totals["elapsed_ms"] = reporter.totals()["elapsed_ms"]
+        reporter.finish(f"{len(args.destinations)} Treasure Hunter workspaces", totals)
+    elif len(args.destinations) == 1:
+        from .project import create_treasure_hunter_structure
+        create_treasure_hunter_structure(args.destinations[0], scaffold_options(args, templates, render_cache))
+    else:
+        from .project import create_many_structures
+        create_many_structures(args.destinations, args.processes, scaffold_options(args, templates, render_cache))
+    if args.assets and scaffolds and not args.watch:
+        seed_destinations(args)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] and argv[0] in SUBCOMMANDS:
+        import importlib
+        importlib.import_module(SUBCOMMANDS[argv[0]], __package__).main(argv[1:])
+        return
+    # Default to the current directory since we're usually already in the treasure-hunter folder
+    args = parse_args(argv)
+    if not args.profile:
+        run(args)
+        return
+
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        run(args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"\nProfile written to {args.profile}; top functions by cumulative time:", file=sys.stderr)
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(15)
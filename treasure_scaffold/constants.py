@@ -0,0 +1,34 @@
+"""Option values and defaults shared by the command line and the modules behind it.
+
+Nothing here imports anything, so the command line can offer choices and
+defaults without loading the engine, backends or archive writer for an
+action that never uses them. The owning modules import their names from
+here and remain where the package exports them from.
+"""
+
+# archive
+ARCHIVE_FORMATS = ("tar.gz", "zip")
+
+# backends
+DURABILITY_MODES = ("none", "file", "batch")
+LINK_MODES = ("hardlink", "reflink")
+
+# engine: rough cost of one filesystem operation, used by the dry-run
+# planner; --io-latency overrides it for remote mounts
+IO_LATENCY_MS = 0.05
+
+# manifest: location of the manifest of generated files, relative to the
+# destination, and of the generated content each managed file derives
+# from, for three-way merges
+MANIFEST_PATH = ".treasure-hunter/manifest.json"
+BASES_PATH = ".treasure-hunter/bases.z"
+
+# rendercache: bound on the bytes a cache keeps by default; least recently
+# used entries go first
+RENDER_CACHE_SIZE = 64 << 20
+
+# report
+REPORT_MODES = ("verbose", "summary", "quiet", "jsonl")
+
+# watch: seconds between polls
+WATCH_INTERVAL = 0.1
@@ -0,0 +1,285 @@
+"""Synthetic users, merchants, listings and swipes for backend load testing.
+
+Rows are produced in fixed-size chunks. Each chunk draws from its own
+random.Random seeded with (seed, entity, chunk index), fills whole columns
+at a time and formats them into one block of text, so the output depends
+only on the seed and the chunk size, not on how many processes generated
+it. Chunks are written in order as they complete, with a bounded number
+in flight, so memory stays constant however many rows are asked for.
+
+Field names follow the backend's Mongoose models; ids are 24-digit hex
+strings that encode the entity and row number, so listings and swipes
+can reference users, merchants and listings that exist in the datasets
+generated with the same counts.
+
+Usage: set-up.py dataset ENTITY [--rows N] [--format ndjson|csv] [--seed S]
+                                [-o FILE] [--processes P] [--chunk-size K]
+"""
+import os
+import random
+import sys
+
+ENTITIES = ("users", "merchants", "listings", "swipes")
+FORMATS = ("ndjson", "csv")
+# High byte of each entity's ids
+_ID_PREFIX = {"users": 0x01, "merchants": 0x02, "listings": 0x03, "swipes": 0x04}
+
+# Metro areas that listings and people cluster around: (name, latitude, longitude)
+CITIES = (
+    ("New York, NY", 40.7128, -74.0060), ("Los Angeles, CA", 34.0522, -118.2437),
+    ("Chicago, IL", 41.8781, -87.6298), ("Houston, TX", 29.7604, -95.3698),
+    ("Philadelphia, PA", 39.9526, -75.1652), ("Boston, MA", 42.3601, -71.0589),
+    ("Charleston, SC", 32.7765, -79.9311), ("Savannah, GA", 32.0809, -81.0912),
+    ("New Orleans, LA", 29.9511, -90.0715), ("Santa Fe, NM", 35.6870, -105.9378),
+    ("Seattle, WA", 47.6062, -122.3321), ("Portland, ME", 43.6591, -70.2568),
+    ("Denver, CO", 39.7392, -104.9903), ("Nashville, TN", 36.1627, -86.7816),
+    ("San Francisco, CA", 37.7749, -122.4194), ("Richmond, VA", 37.5407, -77.4360),
+)
+# Category, typical price in dollars, items
+CATEGORIES = (
+    ("furniture", 450, ("dresser", "armchair", "writing desk", "bench", "armoire", "side table")),
+    ("jewelry", 220, ("brooch", "locket", "cameo ring", "pocket watch", "bracelet", "hatpin")),
+    ("art", 600, ("oil painting", "etching", "watercolor", "bronze bust", "lithograph", "miniature")),
+    ("ceramics", 90, ("vase", "teapot", "platter", "figurine", "jardiniere", "tureen")),
+    ("clocks", 300, ("mantel clock", "wall clock", "carriage clock", "regulator", "cuckoo clock")),
+    ("books", 60, ("first edition", "atlas", "bible", "almanac", "folio", "travel journal")),
+    ("coins", 120, ("silver dollar", "gold sovereign", "proof set", "trade token", "half eagle")),
+    ("textiles", 150, ("quilt", "sampler", "tapestry", "rug", "lace collar", "shawl")),
+    ("lighting", 180, ("oil lamp", "chandelier", "sconce", "lantern", "candelabra")),
+    ("silverware", 140, ("tea service", "ladle", "flatware set", "sugar bowl", "salver")),
+)
+ERAS = ("Georgian", "Victorian", "Edwardian", "Art Nouveau", "Art Deco", "Mid-Century", "Colonial", "Federal")
+ADJECTIVES = ("restored", "original", "signed", "hand-carved", "rare", "ornate", "primitive", "gilded",
+              "weathered", "matched", "early", "provincial")
+TAGS = ("vintage", "antique", "collectible", "handmade", "estate", "mahogany", "oak", "walnut", "brass",
+        "sterling", "porcelain", "glass", "gold", "silver", "signed", "provenance", "restored", "original finish",
+        "needs repair", "pair", "set", "museum quality", "heirloom", "farmhouse")
+FIRST_NAMES = ("Ada", "Ben", "Clara", "Dev", "Elena", "Felix", "Grace", "Hiro", "Iris", "Jonah", "Kemi", "Liam",
+               "Maya", "Noah", "Olga", "Priya", "Quinn", "Rosa", "Sam", "Tariq", "Uma", "Victor", "Wen", "Yara")
+LAST_NAMES = ("Abbott", "Baker", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Haddad", "Ito", "Jensen", "Khan",
+              "Lopez", "Moreau", "Nguyen", "Okafor", "Patel", "Quist", "Rossi", "Silva", "Tanaka", "Umar", "Varga")
+SHOP_WORDS = ("Attic", "Heirloom", "Curiosity", "Relic", "Gaslight", "Brass Key", "Old Mill", "Lantern",
+              "Salvage", "Keepsake", "Parlor", "Tinker")
+SWIPES = ("like", "pass", "superlike")
+LISTING_STATUSES = ("available", "available", "available", "pending", "sold")
+IMAGE_HOST = "https://images.treasurehunter.com"
+# Rows are dated within two years starting 2024-01-01
+_EPOCH_DAYS = 730
+
+
+def _days():
+    """ISO dates of every day in the range, computed once per process"""
+    import datetime
+    start = datetime.date(2024, 1, 1)
+    return [(start + datetime.timedelta(days=day)).isoformat() for day in range(_EPOCH_DAYS)]
+
+
+_DAY_NAMES = None
+
+
+def _timestamps(rng, count):
+    """count ISO 8601 timestamps in the dataset's date range"""
+    global _DAY_NAMES
+    if _DAY_NAMES is None:
+        _DAY_NAMES = _days()
+    days, randrange = _DAY_NAMES, rng.randrange
+    stamps = []
+    for _ in range(count):
+        seconds = randrange(86400)
+        stamps.append(f"{days[randrange(_EPOCH_DAYS)]}T{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}Z")
+    return stamps
+
+
+def _object_id(entity, index):
+    """Mongo-style id for row index of entity"""
+    return f"{_ID_PREFIX[entity]:02x}{index:022x}"
+
+
+def _locations(rng, count):
+    """(city, latitude, longitude) clustered around CITIES"""
+    cities = rng.choices(CITIES, k=count)
+    uniform = rng.uniform
+    return [(city, round(latitude + uniform(-0.35, 0.35), 5), round(longitude + uniform(-0.35, 0.35), 5))
+            for city, latitude, longitude in cities]
+
+
+def _people(entity, rng, start, count, fmt, references):
+    """Users and merchants share a layout; merchants sell and carry a shop name"""
+    ids = [_object_id(entity, index) for index in range(start, start + count)]
+    firsts = rng.choices(FIRST_NAMES, k=count)
+    lasts = rng.choices(LAST_NAMES, k=count)
+    locations = _locations(rng, count)
+    registered = _timestamps(rng, count)
+    premium = [rng.random() < 0.12 for _ in range(count)]
+    radius = rng.choices((10, 25, 50, 100), weights=(2, 4, 5, 1), k=count)
+    if entity == "merchants":
+        kinds = rng.choices(("seller", "both"), weights=(3, 1), k=count)
+        shops = [f"{first}'s {word} Antiques" for first, word in zip(firsts, rng.choices(SHOP_WORDS, k=count))]
+    else:
+        kinds = rng.choices(("buyer", "both"), weights=(9, 1), k=count)
+        shops = [""] * count
+    rows = []
+    if fmt == "ndjson":
+        for index, (id_, first, last, (city, lat, lng), date, paid, miles, kind, shop) in enumerate(zip(
+                ids, firsts, lasts, locations, registered, premium, radius, kinds, shops), start):
+            shop_field = f',"shopName":"{shop}"' if shop else ""
+            rows.append(
+                f'{{"_id":"{id_}","name":"{first} {last}","email":"{first.lower()}.{last.lower()}{index}@example.com",'
+                f'"userType":"{kind}"{shop_field},"location":{{"type":"Point","coordinates":[{lng},{lat}],'
+                f'"address":"{city}"}},"subscriptionStatus":"{"premium" if paid else "free"}",'
+                f'"preferences":{{"searchRadius":{miles}}},"registrationDate":"{date}"}}'
+            )
+    else:
+        for index, (id_, first, last, (city, lat, lng), date, paid, miles, kind, shop) in enumerate(zip(
+                ids, firsts, lasts, locations, registered, premium, radius, kinds, shops), start):
+            rows.append(
+                f'{id_},{first} {last},{first.lower()}.{last.lower()}{index}@example.com,{kind},{shop},'
+                f'{lng},{lat},"{city}",{"premium" if paid else "free"},{miles},{date}'
+            )
+    return rows
+
+
+def _listings(entity, rng, start, count, fmt, references):
+    ids = [_object_id(entity, index) for index in range(start, start + count)]
+    sellers = [_object_id("merchants", rng.randrange(references["merchants"])) for _ in range(count)]
+    categories = rng.choices(CATEGORIES, k=count)
+    eras = rng.choices(ERAS, k=count)
+    adjectives = rng.choices(ADJECTIVES, k=count)
+    lognormvariate, choice, sample, randrange = rng.lognormvariate, rng.choice, rng.sample, rng.randrange
+    prices = [round(typical * lognormvariate(0, 0.6), 2) for _, typical, _ in categories]
+    tags = [sample(TAGS, randrange(1, 5)) for _ in range(count)]
+    images = [randrange(1, 6) for _ in range(count)]
+    statuses = rng.choices(LISTING_STATUSES, k=count)
+    locations = _locations(rng, count)
+    created = _timestamps(rng, count)
+    views = [int(lognormvariate(3, 1.2)) for _ in range(count)]
+    rows = []
+    for id_, seller, (category, _, items), era, adjective, price, tag_list, image_count, status, (
+            city, lat, lng), date, seen in zip(ids, sellers, categories, eras, adjectives, prices, tags, images,
+                                               statuses, locations, created, views):
+        title = f"{adjective.capitalize()} {era} {choice(items)}"
+        urls = [f"{IMAGE_HOST}/listings/{id_}/{number}.jpg" for number in range(image_count)]
+        if fmt == "ndjson":
+            image_list = '","'.join(urls)
+            tag_names = '","'.join(tag_list)
+            rows.append(
+                f'{{"_id":"{id_}","sellerId":"{seller}","title":"{title}","price":{price},'
+                f'"images":["{image_list}"],"category":"{category}","tags":["{tag_names}"],'
+                f'"location":{{"type":"Point","coordinates":[{lng},{lat}],"address":"{city}"}},'
+                f'"status":"{status}","metrics":{{"views":{seen}}},"createdAt":"{date}"}}'
+            )
+        else:
+            rows.append(
+                f'{id_},{seller},{title},{price},{"|".join(urls)},{category},{"|".join(tag_list)},'
+                f'{lng},{lat},"{city}",{status},{seen},{date}'
+            )
+    return rows
+
+
+def _swipes(entity, rng, start, count, fmt, references):
+    ids = [_object_id(entity, index) for index in range(start, start + count)]
+    randrange = rng.randrange
+    users = [_object_id("users", randrange(references["users"])) for _ in range(count)]
+    listings = [_object_id("listings", randrange(references["listings"])) for _ in range(count)]
+    directions = rng.choices(SWIPES, weights=(30, 65, 5), k=count)
+    created = _timestamps(rng, count)
+    dwell = [randrange(200, 9000) for _ in range(count)]
+    if fmt == "ndjson":
+        return [f'{{"_id":"{id_}","userId":"{user}","listingId":"{listing}","direction":"{direction}",'
+                f'"dwellMs":{ms},"createdAt":"{date}"}}'
+                for id_, user, listing, direction, ms, date in zip(ids, users, listings, directions, dwell, created)]
+    return [f"{id_},{user},{listing},{direction},{ms},{date}"
+            for id_, user, listing, direction, ms, date in zip(ids, users, listings, directions, dwell, created)]
+
+
+_GENERATORS = {"users": _people, "merchants": _people, "listings": _listings, "swipes": _swipes}
+CSV_HEADERS = {
+    "users": "_id,name,email,userType,shopName,longitude,latitude,address,subscriptionStatus,searchRadius,"
+             "registrationDate",
+    "listings": "_id,sellerId,title,price,images,category,tags,longitude,latitude,address,status,views,createdAt",
+    "swipes": "_id,userId,listingId,direction,dwellMs,createdAt",
+}
+CSV_HEADERS["merchants"] = CSV_HEADERS["users"]
+
+
+def generate_chunk(entity, seed, chunk, chunk_size, rows, fmt, references):
+    """Text of one chunk of rows, identical for the same arguments on any machine"""
+    start = chunk * chunk_size
+    count = min(chunk_size, rows - start)
+    rng = random.Random(f"{seed}:{entity}:{chunk}")
+    lines = _GENERATORS[entity](entity, rng, start, count, fmt, references)
+    return "\n".join(lines) + "\n"
+
+
+def write_dataset(entity, rows, output, fmt="ndjson", seed=0, chunk_size=50000, processes=1, references=None):
+    """Stream rows of entity to output, a text stream, chunk by chunk.
+
+    references gives the number of users, merchants and listings that
+    foreign keys are drawn from. With processes > 1 chunks are generated
+    by a process pool, at most two per worker ahead of the writer.
+    """
+    if entity not in ENTITIES:
+        raise ValueError(f"Unknown entity {entity!r}; choose from {', '.join(ENTITIES)}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; choose from {', '.join(FORMATS)}")
+    references = {"users": 100000, "merchants": 10000, "listings": 1000000, **(references or {})}
+    chunks = range((rows + chunk_size - 1) // chunk_size)
+    if fmt == "csv":
+        output.write(CSV_HEADERS[entity] + "\n")
+    if processes == 1 or len(chunks) < 2:
+        for chunk in chunks:
+            output.write(generate_chunk(entity, seed, chunk, chunk_size, rows, fmt, references))
+        return
+
+    import collections
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = collections.deque()
+        for chunk in chunks:
+            if len(pending) >= processes * 2:
+                output.write(pending.popleft().result())
+            pending.append(pool.submit(generate_chunk, entity, seed, chunk, chunk_size, rows, fmt, references))
+        while pending:
+            output.write(pending.popleft().result())
+
+
+def main(argv=None):
+    """set-up.py dataset: write synthetic data for load tests"""
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(prog="set-up.py dataset", description=__doc__.splitlines()[0])
+    parser.add_argument("entity", choices=ENTITIES)
+    parser.add_argument("--rows", type=int, default=1000, help="number of rows to generate (default: 1000)")
+    parser.add_argument("--format", dest="fmt", choices=FORMATS, default="ndjson")
+    parser.add_argument("--seed", default="0", help="any string; the same seed gives the same rows (default: 0)")
+    parser.add_argument("-o", "--output", default="-", help="file to write, '-' for stdout; .gz is compressed")
+    parser.add_argument("-p", "--processes", type=int, default=None,
+                        help="generator processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=50000,
+                        help="rows per chunk; changing it changes the rows a seed produces (default: 50000)")
+    for entity in ("users", "merchants", "listings"):
+        parser.add_argument(f"--{entity}", type=int, metavar="N",
+                            help=f"number of {entity} that foreign keys refer to")
+    args = parser.parse_args(argv)
+    if args.rows < 0 or args.chunk_size < 1:
+        parser.error("--rows must be positive and --chunk-size at least 1")
+    references = {entity: getattr(args, entity) for entity in ("users", "merchants", "listings")
+                  if getattr(args, entity)}
+
+    if args.output == "-":
+        output = sys.stdout
+    elif args.output.endswith(".gz"):
+        import gzip
+        output = gzip.open(args.output, "wt", encoding="utf-8", compresslevel=1)
+    else:
+        output = open(args.output, "w", encoding="utf-8", buffering=1 << 20)
+    start = time.perf_counter()
+    try:
+        write_dataset(args.entity, args.rows, output, args.fmt, args.seed, args.chunk_size,
+                      args.processes or os.cpu_count() or 1, references)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {args.rows} {args.entity} in {elapsed:.1f} s ({args.rows / max(elapsed, 1e-9):,.0f} rows/s)",
+          file=sys.stderr)
@@ -0,0 +1,277 @@
+"""Executing compiled plans, and planning a run without executing it"""
+import collections
+import functools
+from collections import namedtuple
+
+from .backends import DiskBackend
+from .constants import IO_LATENCY_MS
+from .manifest import (BASES_PATH, _base_digest, _digest, _is_pristine, _stat_record, load_bases, load_manifest,
+                       save_bases, save_manifest)
+from .merge import merge3
+from .plan import file_payload
+from .report import Reporter
+
+
+def classify_file(backend, path, data, record):
+    """Decide what materializing one planned file would do, without writing.
+
+    Returns one of "create", "update", "unchanged", "modified" (the user
+    edited a generated file whose template has since changed, or a file
+    hard-linked from a content store that no longer holds what was
+    linked) or "unmanaged" (the file exists, differs, and was never
+    generated by us). A file that holds a merge result counts as edited.
+    """
+    if record is not None and _base_digest(record) != _digest(data):
+        if "base" not in record and _is_pristine(backend, path, record):
+            return "update"
+        return "modified"
+    if not backend.exists(path):
+        return "create"
+    if record is not None:
+        # A shared inode changes when any workspace linked to it is edited, so
+        # only its own stat shows whether it still holds the generated content
+        if record.get("linked") and not _is_pristine(backend, path, record):
+            return "modified"
+        return "unchanged"
+    return "unchanged" if _digest(backend.read(path)) == _digest(data) else "unmanaged"
+
+
+def _merge_result(backend, path, data, record, bases):
+    """Outcome of merging a template change into an edited file, without writing.
+
+    Returns ("merged", merged bytes), ("conflict", None), or ("modified",
+    None) when there is nothing to merge against.
+    """
+    base = bases.get(_base_digest(record))
+    current = backend.read(path)
+    if base is None or current is None:
+        # Generated before base content was recorded; nothing to merge against
+        return "modified", None
+    merged = merge3(base, current, data)
+    return ("conflict", None) if merged is None else ("merged", merged)
+
+
+def _merge(backend, path, data, record, bases):
+    """Three-way merge a template change into a file edited since it was generated"""
+    status, merged = _merge_result(backend, path, data, record, bases)
+    if merged is None:
+        return status, record
+    return status, _stat_record(_digest(merged), backend.write(path, merged, overwrite=True), base=_digest(data))
+
+
+def _materialize(backend, path, data, record, bases=None):
+    """Bring one planned file up to date.
+
+    Returns the classify_file() status, or "merged"/"conflict" when bases
+    (see load_bases) is given and an edited file was merged, and the
+    manifest entry to keep for the file, if any.
+    """
+    status = classify_file(backend, path, data, record)
+    if status == "modified" and bases is not None:
+        return _merge(backend, path, data, record, bases)
+    if status == "create":
+        try:
+            return status, _stat_record(_digest(data), backend.write(path, data))
+        except FileExistsError:
+            # Appeared since it was classified; leave it alone
+            return "unmanaged", None
+    if status == "update":
+        return status, _stat_record(_digest(data), backend.write(path, data, overwrite=True))
+    if status == "unchanged" and record is None:
+        # Identical output from before manifests existed; adopt it
+        return status, _stat_record(_digest(data), backend.stat(path))
+    return status, record
+
+
+def _record_batch(reporter, backend, current, paths, payloads, results):
+    """Report _materialize() results in plan order, adding what to keep to the manifest current"""
+    for path, data, (status, record) in zip(paths, payloads, results):
+        reporter.file_processed(backend, path, status, len(data))
+        if record is not None:
+            current[path] = record
+
+
+def _unplanned(previous, files):
+    """Manifest entries for files outside this plan (e.g. other groups), kept as they are"""
+    planned = {entry.path for entry in files}
+    return {path: record for path, record in previous.items() if path not in planned}
+
+
+def _state_changed(backend, previous, current):
+    """Whether the manifest and bases need saving after a run"""
+    return current != previous or bool(current) and not backend.exists(BASES_PATH)
+
+
+def _save_state(backend, current, payloads, bases=None):
+    """Save the manifest and the base content of every managed file.
+
+    payloads may be a generator; bodies are hashed and compressed one at a time.
+    """
+    save_manifest(backend, current)
+    save_bases(backend, current, ((_digest(data), data) for data in payloads), bases)
+
+
+# Files are rendered, written and reported this many at a time, so however
+# large the plan only one batch of rendered bodies is in memory
+FILE_BATCH = 1024
+
+
+def _batches(files, size=FILE_BATCH):
+    """Consecutive slices of files; an empty plan still gets one, so its phases are reported"""
+    for start in range(0, len(files) or 1, size):
+        yield files[start:start + size]
+
+
+def _render_batch(compiled, batch):
+    """Bodies of a batch of planned files, in order"""
+    return [file_payload(compiled, entry) for entry in batch]
+
+
+def execute_plan(compiled, backend, jobs=1, manifest=True, reporter=None, merge=False):
+    """Materialize a compiled plan through a storage backend in one pass.
+
+    backend may also be a directory path, which is wrapped in a
+    DiskBackend; otherwise closing the backend is up to the caller.
+    Directories arrive parent-first, so each one is a single mkdir. With
+    jobs > 1 and a backend that allows it, the file writes are spread over
+    a thread pool once every directory exists; results are still reported
+    in plan order. Files are rendered and written FILE_BATCH at a time, so
+    for template-backed entries memory does not grow with the amount of
+    content in the plan; literal bodies given to add_file are held by the
+    plan itself for as long as it lives.
+
+    Existing files are only rewritten when the manifest from a previous run
+    shows both that their template changed and that nobody edited them
+    since. With merge, edited files get the template change too, through a
+    three-way merge against the content they were generated from; files
+    where both sides changed the same lines are left alone. The manifest
+    and base content are saved again only if something changed, so a
+    re-run over an up-to-date tree performs no writes.
+
+    Progress goes to reporter. Without one, the verbose lines are printed
+    but no summary; a caller-supplied reporter is left for the caller to
+    finish.
+    """
+    if isinstance(backend, str):
+        backend = DiskBackend(backend)
+        try:
+            return execute_plan(compiled, backend, jobs, manifest, reporter, merge)
+        finally:
+            backend.close()
+    if reporter is None:
+        reporter = Reporter()
+        try:
+            return execute_plan(compiled, backend, jobs, manifest, reporter, merge)
+        finally:
+            reporter.flush()
+
+    with reporter.phase("directories", backend):
+        for directory in compiled.directories:
+            if backend.mkdir(directory):
+                reporter.directory_created(backend, directory)
+
+    with reporter.phase("manifest", backend):
+        previous = load_manifest(backend) if manifest else {}
+        bases = load_bases(backend) if manifest and merge else None
+    current = _unplanned(previous, compiled.files)
+    materialize = functools.partial(_materialize, backend, bases=bases)
+    executor = None
+    if jobs > 1 and len(compiled.files) > 1 and backend.concurrent:
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=jobs)
+    try:
+        for batch in _batches(compiled.files):
+            with reporter.phase("render", backend):
+                paths = [entry.path for entry in batch]
+                payloads = _render_batch(compiled, batch)
+                records = [previous.get(path) for path in paths]
+            with reporter.phase("files", backend):
+                if executor is not None:
+                    results = list(executor.map(materialize, paths, payloads, records))
+                else:
+                    results = [materialize(*args) for args in zip(paths, payloads, records)]
+                _record_batch(reporter, backend, current, paths, payloads, results)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    if manifest and _state_changed(backend, previous, current):
+        with reporter.phase("manifest", backend):
+            # Rendering again is cheaper than keeping every body until now
+            _save_state(backend, current, (file_payload(compiled, entry) for entry in compiled.files), bases)
+
+
+# Rough cost of streaming bytes, used by the dry-run planner beside IO_LATENCY_MS
+IO_THROUGHPUT_MB_S = 200
+# Operations behind each change: mkdir for a directory; open, fstat and
+# rename for a file written through a temporary name
+IO_OPS = {"directory": 1, "file": 3}
+
+PlannedChange = namedtuple("PlannedChange", ["path", "action", "size", "current", "new"])
+
+
+def plan_changes(compiled, backend, manifest=True, merge=False):
+    """Work out what execute_plan would do, without writing anything.
+
+    Returns (directories, changes): the directories that would be created
+    and a PlannedChange per planned file. current and new hold the on-disk
+    and rendered bytes for files whose content would differ, for diffing.
+    With merge, as for execute_plan, edited files are merged in memory and
+    reported as "merged", with the merge result as new, or as "conflict".
+    """
+    if isinstance(backend, str):
+        backend = DiskBackend(backend)
+    directories = [directory for directory in compiled.directories if not backend.exists(directory)]
+    previous = load_manifest(backend) if manifest else {}
+    bases = load_bases(backend) if manifest and merge else None
+    changes = []
+    for entry in compiled.files:
+        data = file_payload(compiled, entry)
+        record = previous.get(entry.path)
+        action = classify_file(backend, entry.path, data, record)
+        if action == "modified" and bases is not None:
+            action, merged = _merge_result(backend, entry.path, data, record, bases)
+            if merged is not None:
+                data = merged
+        current = new = None
+        if action in ("update", "merged", "modified", "conflict", "unmanaged"):
+            current, new = backend.read(entry.path) or b"", data
+        changes.append(PlannedChange(entry.path, action, len(data), current, new))
+    return directories, changes
+
+
+def format_plan(target, directories, changes, io_latency_ms=IO_LATENCY_MS, diff=True):
+    """Human readable dry-run report, with unified diffs for changed files"""
+    import difflib
+    counts = collections.Counter(change.action for change in changes)
+    written = [change for change in changes if change.action in ("create", "update", "merged")]
+    write_bytes = sum(change.size for change in written)
+    operations = len(directories) * IO_OPS["directory"] + len(written) * IO_OPS["file"]
+    cost_ms = operations * io_latency_ms + write_bytes / (IO_THROUGHPUT_MB_S * 1e3)
+
+    lines = [
+        f"Plan for {target}",
+        f"  directories to create: {len(directories)}",
+        f"  files to create: {counts['create']}, update: {counts['update']}, "
+        + (f"merge: {counts['merged']}, " if counts["merged"] or counts["conflict"] else "")
+        + f"unchanged: {counts['unchanged']}",
+        f"  files skipped: {counts['modified']} locally modified, {counts['unmanaged']} not generated by us"
+        + (f", {counts['conflict']} conflicting" if counts["merged"] or counts["conflict"] else ""),
+        f"  bytes to write: {write_bytes}",
+        f"  estimated I/O: {operations} operations, ~{cost_ms:.1f} ms",
+    ]
+    markers = {"create": "+", "update": "~", "merged": "*", "modified": "!", "conflict": "x", "unmanaged": "?"}
+    for directory in directories:
+        lines.append(f"+ {directory}/")
+    for change in changes:
+        if change.action in markers:
+            lines.append(f"{markers[change.action]} {change.path}")
+    if diff:
+        for change in changes:
+            if change.new is None:
+                continue
+            lines.extend(line.rstrip("\n") for line in difflib.unified_diff(
+                change.current.decode("utf-8", "replace").splitlines(True),
+                change.new.decode("utf-8", "replace").splitlines(True),
+                f"a/{change.path}", f"b/{change.path}",
+            ))
+    return "\n".join(lines)
@@ -0,0 +1,116 @@
+"""The Treasure Hunter app's component groups and the plan built from them"""
+from .plan import ScaffoldPlan
+
+
+# Component groups that can be scaffolded on their own. Each lists the
+# directories and templated files it owns and the groups it cannot work
+# without.
+GROUPS = {
+    "project": {
+        "directories": ["scripts"],
+        "files": ["README.md", "package.json", ".gitignore"],
+        "requires": [],
+    },
+    "tooling": {
+        "directories": [],
+        "files": [".vscode/settings.json", ".eslintrc.js", ".prettierrc.js",
+                  "babel.config.js", "metro.config.js"],
+        "requires": ["project"],
+    },
+    "native": {
+        "directories": ["android", "ios"],
+        "files": [],
+        "requires": [],
+    },
+    "styles": {
+        "directories": [],
+        "files": ["src/styles/colors.js", "src/styles/typography.js"],
+        "requires": [],
+    },
+    "api": {
+        "directories": [],
+        "files": ["src/api/config.js"],
+        "requires": [],
+    },
+    "common": {
+        "directories": [],
+        "files": ["src/components/common/Button.js"],
+        "requires": ["styles"],
+    },
+    "discovery": {
+        "directories": [],
+        "files": ["src/components/discovery/SwipeCard.js"],
+        "requires": ["styles"],
+    },
+    "navigation": {
+        "directories": [],
+        "files": ["src/navigation/index.js", "src/navigation/AuthNavigator.js",
+                  "src/navigation/MainNavigator.js", "src/navigation/MerchantNavigator.js"],
+        "requires": [],
+    },
+    "app": {
+        "directories": [
+            "src/context", "src/hooks", "src/services", "src/utils",
+            "src/assets/fonts", "src/assets/images", "src/assets/animations",
+            "src/components/listings", "src/components/offers", "src/components/messaging",
+            "src/screens/auth", "src/screens/discovery", "src/screens/messaging",
+            "src/screens/profile", "src/screens/merchant",
+            "src/store/actions", "src/store/reducers", "src/store/selectors",
+        ],
+        "files": ["App.js"],
+        "requires": ["project", "tooling", "native", "api", "styles", "common", "discovery", "navigation"],
+    },
+    "backend": {
+        "directories": ["backend/controllers", "backend/models", "backend/routes",
+                        "backend/services", "backend/middleware", "backend/config"],
+        "files": [],
+        "requires": [],
+    },
+    "docs": {
+        "directories": ["docs/api", "docs/architecture", "docs/setup", "docs/ui"],
+        "files": [],
+        "requires": [],
+    },
+    "tests": {
+        "directories": ["tests/unit", "tests/integration", "tests/e2e", "tests/fixtures"],
+        "files": [],
+        "requires": [],
+    },
+}
+
+
+def resolve_groups(names=None):
+    """Expand group names with everything they require, in GROUPS order.
+
+    None selects every group. Unknown names raise ValueError.
+    """
+    if names is None:
+        return list(GROUPS)
+    selected = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in GROUPS:
+            raise ValueError(f"Unknown group {name!r}; choose from {', '.join(GROUPS)}")
+        if name not in selected:
+            selected.add(name)
+            pending.extend(GROUPS[name]["requires"])
+    return [name for name in GROUPS if name in selected]
+
+
+def build_treasure_hunter_plan(templates=None, groups=None, variables=None, render_cache=None):
+    """Describe the folder structure for the Treasure Hunter app.
+
+    groups limits the plan to the named component groups plus whatever they
+    depend on; by default everything is included. variables customizes the
+    rendered templates, and render_cache (a RenderCache) reuses output
+    rendered by earlier runs.
+    """
+    plan = ScaffoldPlan(templates, variables, render_cache)
+    for name in resolve_groups(groups):
+        group = GROUPS[name]
+        for directory in group["directories"]:
+            plan.add_directory(directory)
+        for path in group["files"]:
+            plan.add_template(path)
+    return plan
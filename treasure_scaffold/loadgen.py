@@ -0,0 +1,469 @@
+"""Open-loop HTTP load generation against the API_ENDPOINTS contract.
+
+The endpoint map is read from src/api/config.js, either the template the
+scaffold renders or a scaffolded project's copy, so the load follows the
+same contract as the app. Sessions (a swipe, a browse, an offer, a login)
+arrive as a Poisson process at a fixed rate whether or not earlier ones
+have finished, and each request's latency is measured from the moment it
+was due, so a slow server shows up as latency rather than as a lower
+request rate. Requests share a bounded pool of keep-alive connections.
+
+serve_stub() is a small stand-in server answering every endpoint in the
+map, so the generator can be exercised without the backend.
+
+Usage: set-up.py loadtest (--url URL | --stub) [--rate R] [--duration S]
+                          [--connections N] [--mix swipe=80,browse=15,offer=5]
+"""
+import asyncio
+import json
+import math
+import random
+import re
+import sys
+
+from .dataset import _object_id
+
+# What each kind of session does, in order: (method, endpoint key)
+SCENARIOS = {
+    "swipe": (("GET", "DISCOVERY.GET_ITEMS"), ("POST", "DISCOVERY.INTERACTION")),
+    "browse": (("GET", "LISTINGS.GET_ALL"), ("GET", "LISTINGS.GET_ONE")),
+    # The contract has no offers endpoint yet; an offer is a close look and a superlike
+    "offer": (("GET", "LISTINGS.GET_ONE"), ("POST", "DISCOVERY.INTERACTION")),
+    "login": (("POST", "AUTH.LOGIN"),),
+}
+DEFAULT_MIX = "swipe=80,browse=15,offer=5"
+CONFIG_TEMPLATE = "src/api/config.js"
+
+
+def parse_endpoints(source):
+    """{"GROUP.NAME": path} from the API_ENDPOINTS object in config.js source"""
+    if isinstance(source, bytes):
+        source = source.decode("utf-8")
+    start = source.find("API_ENDPOINTS")
+    if start < 0:
+        raise ValueError("No API_ENDPOINTS map found")
+    endpoints = {}
+    for group, body in re.findall(r"(\w+)\s*:\s*\{([^{}]*)\}", source[start:]):
+        for name, path in re.findall(r"(\w+)\s*:\s*['\"]([^'\"]*)['\"]", body):
+            endpoints[f"{group}.{name}"] = path
+    return endpoints
+
+
+def load_endpoints(config=None, templates=None):
+    """Endpoint map from a config.js file, or from the template by default"""
+    if config:
+        with open(config, "rb") as f:
+            return parse_endpoints(f.read())
+    from .templates import load_templates
+    return parse_endpoints(load_templates(templates).get(CONFIG_TEMPLATE))
+
+
+def parse_mix(text):
+    """{"swipe": 80, ...} from "swipe=80,browse=15"; weights need not add to 100"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise ValueError(f"Bad weight in {part!r}; expected name=number") from None
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight in {part!r}")
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one positive weight")
+    return mix
+
+
+class LatencyHistogram:
+    """Latencies in log-spaced buckets: about 1% error at any scale in constant memory"""
+
+    GROWTH = 1.02
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.maximum = 0.0
+
+    def record(self, seconds):
+        bucket = int(math.log(max(seconds * 1e6, 1.0)) / math.log(self.GROWTH))
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def merge(self, other):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.maximum = max(self.maximum, other.maximum)
+
+    def percentile(self, fraction):
+        """Latency in seconds below which fraction of the samples fall"""
+        if not self.count:
+            return 0.0
+        rank, seen = fraction * self.count, 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self.GROWTH ** (bucket + 0.5) / 1e6, self.maximum)
+        return self.maximum
+
+
+class ConnectionPool:
+    """At most size keep-alive HTTP/1.1 connections to one host"""
+
+    def __init__(self, url, size=32, timeout=10.0):
+        from urllib.parse import urlsplit
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL {url!r}; expected http:// or https://")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.prefix = parts.path.rstrip("/")
+        self.ssl = parts.scheme == "https" or None
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+        self.opened = 0
+        # Requests sent again after a reused connection turned out to be closed
+        self.retried = 0
+
+    async def _connect(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    async def request(self, method, path, body=None):
+        """(status, body bytes) of one request; raises OSError or TimeoutError on failure.
+
+        A server may close an idle keep-alive connection at any time (Node's
+        default keepAliveTimeout is 5 s). If a reused connection turns out to
+        be closed before any of the response arrives, the request is sent
+        once more on a fresh connection rather than counted as an error.
+        """
+        async with self._slots:
+            reused = bool(self._idle)
+            connection = self._idle.pop() if reused else await self._connect()
+            try:
+                status, data, reusable = await asyncio.wait_for(
+                    self._exchange(*connection, method, path, body), self.timeout)
+            except (ConnectionResetError, BrokenPipeError):
+                connection[1].close()
+                if not reused:
+                    raise
+                self.retried += 1
+                connection = await self._connect()
+                try:
+                    status, data, reusable = await asyncio.wait_for(
+                        self._exchange(*connection, method, path, body), self.timeout)
+                except BaseException:
+                    connection[1].close()
+                    raise
+            except BaseException:
+                connection[1].close()
+                raise
+            if reusable:
+                self._idle.append(connection)
+            else:
+                connection[1].close()
+            return status, data
+
+    async def _exchange(self, reader, writer, method, path, body):
+        payload = json.dumps(body).encode() if body is not None else b""
+        head = f"{method} {self.prefix}{path} HTTP/1.1\r\nHost: {self.host}\r\nAccept: application/json\r\n"
+        if body is not None:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n" + payload)
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Server closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                chunk = await reader.readexactly(size + 2)
+                if not size:
+                    break
+                chunks.append(chunk[:-2])
+            data = b"".join(chunks)
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            return status, await reader.read(), False
+        return status, data, headers.get("connection", "").lower() != "close"
+
+    async def close(self):
+        """Close the idle connections and wait until they are closed"""
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+class _Session:
+    """Builds the path and body of each request in a scenario"""
+
+    def __init__(self, endpoints, rng, listings, users):
+        self.endpoints = endpoints
+        self.rng = rng
+        self.listings = listings
+        self.users = users
+
+    def request(self, scenario, method, key):
+        path = self.endpoints[key]
+        rng = self.rng
+        listing = _object_id("listings", rng.randrange(self.listings))
+        path = path.replace(":id", listing)
+        if key == "LISTINGS.GET_ALL":
+            return f"{path}?page={rng.randrange(1, 50)}&limit=20", None
+        if key == "DISCOVERY.GET_ITEMS":
+            return f"{path}?limit=10", None
+        if key == "DISCOVERY.INTERACTION":
+            action = "superlike" if scenario == "offer" else rng.choices(("like", "pass"), weights=(30, 70))[0]
+            return path, {"listingId": listing, "action": action}
+        if key == "AUTH.LOGIN":
+            return path, {"email": f"user{rng.randrange(self.users)}@example.com", "password": "load-test"}
+        return path, ({} if method in ("POST", "PUT") else None)
+
+
+class LoadResult:
+    """Histograms and error counts from one load run"""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.sessions = LatencyHistogram()
+        self.statuses = {}
+        self.errors = {}
+        self.dropped = 0
+        self.elapsed = 0.0
+
+    def record(self, key, seconds, status):
+        self.endpoints.setdefault(key, LatencyHistogram()).record(seconds)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def error(self, key, error):
+        name = f"{key}: {type(error).__name__}"
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def summary(self):
+        """Plain data for --json"""
+        def describe(histogram):
+            return {"count": histogram.count, "p50_ms": histogram.percentile(0.5) * 1000,
+                    "p95_ms": histogram.percentile(0.95) * 1000, "p99_ms": histogram.percentile(0.99) * 1000,
+                    "max_ms": histogram.maximum * 1000}
+        return {"elapsed": self.elapsed, "dropped": self.dropped, "errors": self.errors,
+                "statuses": {str(status): count for status, count in self.statuses.items()},
+                "sessions": describe(self.sessions),
+                "endpoints": {key: describe(histogram) for key, histogram in sorted(self.endpoints.items())}}
+
+    def format(self):
+        """Table of throughput and latency percentiles per endpoint"""
+        lines = [f"{'endpoint':<24} {'count':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+                 f"{'max ms':>8}"]
+        rows = sorted(self.endpoints.items())
+        overall = LatencyHistogram()
+        for _, histogram in rows:
+            overall.merge(histogram)
+        for key, histogram in rows + [("all requests", overall), ("sessions", self.sessions)]:
+            lines.append(
+                f"{key:<24} {histogram.count:>8} {histogram.count / max(self.elapsed, 1e-9):>8.1f} "
+                f"{histogram.percentile(0.5) * 1000:>8.2f} {histogram.percentile(0.95) * 1000:>8.2f} "
+                f"{histogram.percentile(0.99) * 1000:>8.2f} {histogram.maximum * 1000:>8.2f}"
+            )
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(self.statuses.items()))
+        lines.append(f"Statuses: {statuses or 'none'}")
+        if self.errors:
+            lines.append("Errors: " + ", ".join(f"{name} x{count}" for name, count in sorted(self.errors.items())))
+        if self.dropped:
+            lines.append(f"Dropped {self.dropped} sessions: too many in flight")
+        return "\n".join(lines)
+
+
+async def run_load(pool, endpoints, rate, duration, mix=None, seed=0, max_in_flight=10000, listings=1000000,
+                   users=100000):
+    """Start sessions at rate per second for duration seconds; returns a LoadResult.
+
+    Sessions arriving while max_in_flight are still running are counted as
+    dropped rather than queued, which keeps memory bounded when the server
+    falls behind without slowing the arrival rate.
+    """
+    mix = mix or parse_mix(DEFAULT_MIX)
+    missing = sorted({key for name in mix for _, key in SCENARIOS[name]} - set(endpoints))
+    if missing:
+        raise ValueError(f"API_ENDPOINTS has no {', '.join(missing)}")
+    rng = random.Random(seed)
+    session = _Session(endpoints, rng, listings, users)
+    names, weights = list(mix), list(mix.values())
+    result = LoadResult()
+    loop = asyncio.get_running_loop()
+    running = set()
+
+    async def run_session(scenario, due):
+        started = due
+        try:
+            for method, key in SCENARIOS[scenario]:
+                path, body = session.request(scenario, method, key)
+                try:
+                    status, _ = await pool.request(method, path, body)
+                except (OSError, asyncio.TimeoutError, ValueError, asyncio.IncompleteReadError) as error:
+                    result.error(key, error)
+                    return
+                now = loop.time()
+                result.record(key, now - due, status)
+                due = now
+            result.sessions.record(loop.time() - started)
+        finally:
+            running.discard(asyncio.current_task())
+
+    start = loop.time()
+    due = start
+    while True:
+        due += rng.expovariate(rate)
+        if due - start >= duration:
+            break
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(running) >= max_in_flight:
+            result.dropped += 1
+            continue
+        running.add(loop.create_task(run_session(rng.choices(names, weights)[0], due)))
+    if running:
+        await asyncio.gather(*running)
+    result.elapsed = loop.time() - start
+    return result
+
+
+def _route_pattern(path):
+    return re.compile("^" + re.sub(r":\w+", "[^/]+", re.escape(path)) + "$")
+
+
+async def serve_stub(endpoints, host="127.0.0.1", port=0, latency=0.0):
+    """Start a stand-in API answering every path in endpoints; returns the asyncio Server.
+
+    Each request is answered with a small JSON body after latency seconds;
+    unknown paths get a 404. Connections are kept alive.
+    """
+    routes = [(_route_pattern(path), key) for key, path in endpoints.items()]
+
+    def respond(path):
+        for pattern, key in routes:
+            if pattern.match(path):
+                if key in ("LISTINGS.GET_ALL", "DISCOVERY.GET_ITEMS"):
+                    items = [{"_id": _object_id("listings", index), "title": "Stub listing", "price": 100}
+                             for index in range(10)]
+                    return 200, {"items": items}
+                return 200, {"ok": True, "endpoint": key}
+        return 404, {"error": "Not found"}
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                if length:
+                    await reader.readexactly(length)
+                if latency:
+                    await asyncio.sleep(latency)
+                path = request_line.split()[1].decode("latin-1").split("?")[0]
+                status, body = respond(path)
+                payload = json.dumps(body).encode()
+                writer.write(f"HTTP/1.1 {status} {'OK' if status == 200 else 'Not Found'}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+                             .encode("latin-1") + payload)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, IndexError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def _main_async(args, endpoints, mix):
+    server = None
+    url = args.url
+    if args.serve is not None or args.stub:
+        server = await serve_stub(endpoints, port=args.serve or 0, latency=args.stub_latency / 1000)
+        host, port = server.sockets[0].getsockname()[:2]
+        url = url or f"http://{host}:{port}"
+        if args.serve is not None:
+            print(f"Stub API for {len(endpoints)} endpoints listening on {url} (Ctrl+C to stop)", file=sys.stderr)
+            async with server:
+                await server.serve_forever()
+            return None
+    pool = ConnectionPool(url, args.connections, args.timeout)
+    print(f"Sending {args.rate:g} sessions/s to {url} for {args.duration:g} s "
+          f"over at most {args.connections} connections", file=sys.stderr)
+    try:
+        return await run_load(pool, endpoints, args.rate, args.duration, mix, args.seed, args.max_in_flight)
+    finally:
+        await pool.close()
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+
+def main(argv=None):
+    """set-up.py loadtest: drive load at the API endpoints"""
+    import argparse
+    parser = argparse.ArgumentParser(prog="set-up.py loadtest", description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="base URL of the API to load, e.g. http://localhost:3000/api")
+    target.add_argument("--stub", action="store_true", help="load a local stand-in server started in-process")
+    target.add_argument("--serve", type=int, metavar="PORT",
+                        help="only run the stand-in server on PORT (0 picks a free port)")
+    parser.add_argument("--config", metavar="FILE",
+                        help="read API_ENDPOINTS from this config.js (default: the scaffold template)")
+    parser.add_argument("--rate", type=float, default=50.0, help="sessions started per second (default: 50)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to keep starting sessions (default: 10)")
+    parser.add_argument("--connections", type=int, default=32, help="connection pool size (default: 32)")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"relative weights of {', '.join(SCENARIOS)} sessions (default: {DEFAULT_MIX})")
+    parser.add_argument("--max-in-flight", type=int, default=10000,
+                        help="drop arrivals while this many sessions are running (default: 10000)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds before a request fails (default: 10)")
+    parser.add_argument("--stub-latency", type=float, default=0.0, metavar="MS",
+                        help="delay added by the stand-in server to every response")
+    parser.add_argument("--seed", default="0", help="seed for arrivals and request parameters")
+    parser.add_argument("--json", metavar="FILE", help="also write the results as JSON to FILE")
+    args = parser.parse_args(argv)
+    if args.rate <= 0 or args.duration <= 0 or args.connections < 1:
+        parser.error("--rate and --duration must be positive and --connections at least 1")
+    try:
+        endpoints = load_endpoints(args.config)
+        mix = parse_mix(args.mix)
+        result = asyncio.run(_main_async(args, endpoints, mix))
+    except (OSError, ValueError, KeyError) as error:
+        parser.error(str(error))
+    except KeyboardInterrupt:
+        return
+    if result is None:
+        return
+    print(result.format())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result.summary(), f, indent=2)
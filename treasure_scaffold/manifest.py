@@ -0,0 +1,123 @@
+"""Record of generated files, kept in the destination between runs"""
+import hashlib
+import json
+import sys
+
+from .constants import BASES_PATH, MANIFEST_PATH
+
+MANIFEST_VERSION = 1
+
+
+def _digest(data):
+    """Content hash recorded in the manifest"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(backend):
+    """Load the manifest of previously generated files, if any"""
+    data = backend.read(MANIFEST_PATH)
+    if data is None:
+        return {}
+    try:
+        manifest = json.loads(data)
+    except ValueError:
+        print(f"Ignoring unreadable manifest {backend.describe(MANIFEST_PATH)}", file=sys.stderr)
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(backend, records):
+    """Write the manifest of generated files, replacing any previous one.
+
+    Each file gets one line, encoded on its own, which keeps the manifest
+    readable and diffable without building an indented copy of all of it.
+    """
+    backend.mkdir(MANIFEST_PATH.rpartition("/")[0])
+    entries = ",\n".join(f"    {json.dumps(path)}: {json.dumps(records[path], sort_keys=True)}"
+                          for path in sorted(records))
+    payload = f'{{\n  "files": {{\n{entries}\n  }},\n  "version": {MANIFEST_VERSION}\n}}\n'
+    backend.replace(MANIFEST_PATH, payload.encode("utf-8"))
+
+
+def _stat_record(digest, stat, base=None):
+    """Manifest entry for a file whose content hashes to digest.
+
+    base is the digest of the generated content the file derives from,
+    recorded only when the file holds something else (a merge result).
+    Files hard-linked from a content store are marked, as an edit in any
+    workspace sharing their inode shows up in all of them.
+    """
+    record = {"sha256": digest, "size": stat.size, "mtime_ns": stat.mtime_ns}
+    if base is not None and base != digest:
+        record["base"] = base
+    if stat.linked:
+        record["linked"] = True
+    return record
+
+
+def _base_digest(record):
+    """Digest of the generated content a managed file derives from"""
+    return record.get("base", record["sha256"])
+
+
+def load_bases(backend):
+    """Generated content of managed files by digest, as saved by save_bases()"""
+    import zlib
+    data = backend.read(BASES_PATH)
+    if data is None:
+        return {}
+    try:
+        bases = json.loads(zlib.decompress(data))
+    except (ValueError, zlib.error):
+        print(f"Ignoring unreadable {backend.describe(BASES_PATH)}", file=sys.stderr)
+        return {}
+    return {digest: text.encode("latin-1") for digest, text in bases.items()}
+
+
+def save_bases(backend, records, payloads, bases=None):
+    """Keep the base content of every file in records, dropping the rest.
+
+    payloads yields (digest, content) pairs rendered this run, and may be
+    a generator: each needed body is encoded and compressed as it arrives.
+    Anything else still needed comes from bases or else the previously
+    saved file. Bodies are stored as latin-1 so arbitrary bytes survive JSON.
+    """
+    import zlib
+    needed = {_base_digest(record) for record in records.values()}
+    compressor = zlib.compressobj()
+    chunks = []
+    separator = "{"
+
+    def add(digest, data):
+        nonlocal separator
+        entry = f"{separator}{json.dumps(digest)}: {json.dumps(data.decode('latin-1'))}"
+        chunks.append(compressor.compress(entry.encode("utf-8")))
+        separator = ", "
+
+    for digest, data in payloads:
+        if digest in needed:
+            needed.discard(digest)
+            add(digest, data)
+    if needed:
+        if bases is None:
+            bases = load_bases(backend)
+        for digest in sorted(needed):
+            if digest in bases:
+                add(digest, bases[digest])
+    chunks.append(compressor.compress(b"{}" if separator == "{" else b"}"))
+    chunks.append(compressor.flush())
+    backend.replace(BASES_PATH, b"".join(chunks))
+
+
+def _is_pristine(backend, path, record):
+    """Whether a generated file still holds what was recorded for it"""
+    stat = backend.stat(path)
+    if stat is None:
+        return True
+    if stat.size != record["size"]:
+        return False
+    if stat.mtime_ns == record["mtime_ns"]:
+        return True
+    return _digest(backend.read(path)) == record["sha256"]
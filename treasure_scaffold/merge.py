@@ -0,0 +1,57 @@
+"""Line-based three-way merge of a generated file"""
+import difflib
+
+
+def _changes(base, other):
+    """(start, end, replacement) for each region of base that other changes"""
+    matcher = difflib.SequenceMatcher(None, base, other, autojunk=False)
+    return [(i1, i2, other[j1:j2]) for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+
+def _apply(base, start, end, changes):
+    """base[start:end] with changes, all inside that range, applied"""
+    lines, position = [], start
+    for change_start, change_end, replacement in changes:
+        lines.extend(base[position:change_start])
+        lines.extend(replacement)
+        position = change_end
+    lines.extend(base[position:end])
+    return lines
+
+
+def merge3(base, ours, theirs):
+    """Merge the changes from base to ours and from base to theirs.
+
+    All three are bytes. Returns the merged bytes, or None when both sides
+    change the same or adjacent lines differently.
+    """
+    if ours == base or ours == theirs:
+        return theirs
+    if theirs == base:
+        return ours
+    base_lines = base.splitlines(True)
+    hunks = sorted(
+        [(start, end, lines, 0) for start, end, lines in _changes(base_lines, ours.splitlines(True))]
+        + [(start, end, lines, 1) for start, end, lines in _changes(base_lines, theirs.splitlines(True))],
+        key=lambda hunk: (hunk[0], hunk[1]),
+    )
+    merged, position, index = [], 0, 0
+    while index < len(hunks):
+        # Gather every hunk that overlaps or touches the first one, from either side
+        start, end = hunks[index][0], hunks[index][1]
+        group = [hunks[index]]
+        index += 1
+        while index < len(hunks) and hunks[index][0] <= end:
+            end = max(end, hunks[index][1])
+            group.append(hunks[index])
+            index += 1
+        merged.extend(base_lines[position:start])
+        versions = [_apply(base_lines, start, end, [hunk[:3] for hunk in group if hunk[3] == side])
+                    for side in (0, 1)]
+        sides = {hunk[3] for hunk in group}
+        if len(sides) == 2 and versions[0] != versions[1]:
+            return None
+        merged.extend(versions[sides.pop()])
+        position = end
+    merged.extend(base_lines[position:])
+    return b"".join(merged)
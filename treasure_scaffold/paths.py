@@ -0,0 +1,20 @@
+"""Plan paths: relative, '/'-separated, mapped onto native paths on use"""
+import os
+
+
+def _path_key(path):
+    """Sort key that orders every directory before anything inside it"""
+    return tuple(path.split("/"))
+
+
+def _normalize(path):
+    """Normalize a plan path to a relative, '/'-separated form"""
+    parts = [part for part in path.replace(os.sep, "/").split("/") if part not in ("", ".")]
+    if not parts or ".." in parts:
+        raise ValueError(f"Invalid plan path: {path!r}")
+    return "/".join(parts)
+
+
+def _native_path(base_path, path):
+    """Join a plan path onto the destination using native separators"""
+    return os.path.join(base_path, *path.split("/"))
@@ -0,0 +1,92 @@
+"""Declarative scaffold plans and their compiled, ready-to-execute form"""
+from collections import namedtuple
+
+from .paths import _normalize, _path_key
+from .templates import TemplateRenderer, default_renderer, freeze_variables, load_templates
+
+CompiledPlan = namedtuple("CompiledPlan", ["directories", "files", "renderer", "variables"])
+# A planned file carries either literal content or the name of a template
+PlanFile = namedtuple("PlanFile", ["path", "content", "template"])
+
+
+class ScaffoldPlan:
+    """Declarative description of the directories and files to scaffold.
+
+    Paths are relative to the destination and always use '/' separators.
+    Nothing touches the filesystem until the compiled plan is executed, and
+    template bodies are not even loaded until then; literal content passed
+    to add_file, by contrast, stays in the plan, so large generated trees
+    are best described with templates. templates is a template
+    source (see load_templates) and variables overrides DEFAULT_VARIABLES.
+    render_cache, a RenderCache, keeps rendered output on disk across runs.
+    """
+
+    def __init__(self, templates=None, variables=None, render_cache=None):
+        self.directories = []
+        self.files = []
+        self.templates = templates
+        self.variables = freeze_variables(variables)
+        self.render_cache = render_cache
+
+    def add_directory(self, path):
+        """Record a directory to create"""
+        self.directories.append(_normalize(path))
+
+    def add_directories(self, parent, names):
+        """Record several directories under the same parent"""
+        for name in names:
+            self.add_directory(f"{parent}/{name}")
+
+    def add_file(self, path, content=""):
+        """Record a file to create with optional content"""
+        self.files.append(PlanFile(_normalize(path), content, None))
+
+    def add_template(self, path, name=None):
+        """Record a file rendered from a template, named after path by default"""
+        path = _normalize(path)
+        self.files.append(PlanFile(path, None, _normalize(name) if name else path))
+
+    def compile(self):
+        """Deduplicate and order the plan so it can be executed in one pass.
+
+        Every ancestor of a recorded directory or file becomes a directory
+        entry exactly once, and directories are ordered so that parents
+        always precede their children.
+        """
+        files = {}
+        for entry in self.files:
+            existing = files.get(entry.path)
+            if existing is not None and existing != entry:
+                raise ValueError(f"Conflicting content for {entry.path}")
+            files[entry.path] = entry
+
+        directories = set()
+        for path in self.directories + [entry.path.rpartition("/")[0] for entry in files.values()]:
+            while path and path not in directories:
+                directories.add(path)
+                path = path.rpartition("/")[0]
+
+        collisions = directories.intersection(files)
+        if collisions:
+            raise ValueError(f"Paths planned as both file and directory: {sorted(collisions)}")
+
+        if self.render_cache is not None:
+            renderer = TemplateRenderer(self.templates if self.templates is not None else load_templates(),
+                                        persistent=self.render_cache)
+        elif self.templates is not None:
+            renderer = TemplateRenderer(self.templates)
+        else:
+            renderer = default_renderer()
+        return CompiledPlan(
+            directories=tuple(sorted(directories, key=_path_key)),
+            files=tuple(files[path] for path in sorted(files, key=_path_key)),
+            renderer=renderer,
+            variables=self.variables,
+        )
+
+
+def file_payload(compiled, entry):
+    """Bytes to write for a planned file"""
+    if entry.template is not None:
+        return compiled.renderer.render(entry.template, compiled.variables)
+    return entry.content.encode("utf-8")
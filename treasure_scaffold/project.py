@@ -0,0 +1,167 @@
+"""Scaffolding the Treasure Hunter app into one or many destinations"""
+import functools
+import io
+import os
+import sys
+from collections import namedtuple
+
+from .backends import ContentStore, DiskBackend
+from .engine import execute_plan
+from .groups import build_treasure_hunter_plan
+from .report import Reporter, merge_totals
+
+# Everything that decides how a destination is scaffolded, shared by every
+# entry point. templates, groups, variables and render_cache go into the
+# plan; the rest into executing it. store is a directory, opened as a
+# ContentStore with link (see ContentStore), and merge upgrades an existing
+# tree, merging template changes into edited files.
+ScaffoldOptions = namedtuple(
+    "ScaffoldOptions",
+    ["templates", "groups", "variables", "render_cache", "jobs", "manifest", "durability", "store", "link",
+     "merge", "report"],
+    defaults=(None, None, None, None, 1, True, "none", None, "reflink", False, "verbose"),
+)
+
+# Per-target summaries would drown a large batch; only verbose, and jsonl
+# for log collection, keep them
+_TARGET_SUMMARIES = ("verbose", "jsonl")
+
+# Content store kept for the whole process, so known objects are remembered across targets
+_store = None
+
+
+def _compile_plan(options):
+    """Build and compile the Treasure Hunter plan the options describe"""
+    return build_treasure_hunter_plan(options.templates, options.groups, options.variables,
+                                      options.render_cache).compile()
+
+
+def _content_store(options):
+    """The ContentStore for options.store, if any, reused while it stays the same"""
+    global _store
+    if options.store is None:
+        return None
+    if _store is None or (_store.root, _store.link) != (options.store, options.link):
+        _store = ContentStore(options.store, options.link)
+    return _store
+
+
+def _open_backend(target, options):
+    """Create target if needed and open a DiskBackend on it"""
+    os.makedirs(target, exist_ok=True)
+    return DiskBackend(target, options.durability, store=_content_store(options))
+
+
+def _finish(reporter, target, summary):
+    """End a target's report, with its summary or just its buffered output; returns its totals"""
+    if summary:
+        reporter.finish(target)
+    else:
+        reporter.flush()
+    return reporter.totals()
+
+
+def _scaffold_one(compiled, target, options, reporter, summary=True):
+    """Execute a compiled plan into target and commit it; returns its totals"""
+    backend = _open_backend(target, options)
+    try:
+        execute_plan(compiled, backend, jobs=options.jobs, manifest=options.manifest, reporter=reporter,
+                     merge=options.merge)
+    finally:
+        with reporter.phase("commit", backend):
+            backend.close()
+    return _finish(reporter, target, summary)
+
+
+def create_treasure_hunter_structure(base_path, options=None, hooks=(), **overrides):
+    """Create the entire folder structure for the Treasure Hunter app.
+
+    options is a ScaffoldOptions; keyword arguments override single fields
+    of it. Each of hooks is called with a PhaseStats as each phase ends.
+    """
+    options = (options or ScaffoldOptions())._replace(**overrides)
+    reporter = Reporter(options.report, hooks=hooks, target=base_path)
+    with reporter.phase("plan"):
+        compiled = _compile_plan(options)
+    _scaffold_one(compiled, base_path, options, reporter)
+    if options.report != "verbose":
+        return
+
+    print("\nTreasure Hunter App folder structure has been created successfully!")
+    print(f"Project location: {os.path.abspath(base_path)}")
+    print("\nNext steps:")
+    print("1. Navigate to the project directory")
+    print("2. Run 'npm install' to install dependencies")
+    print("3. Run 'npx react-native start' to start the Metro bundler")
+    print("4. In another terminal, run 'npx react-native run-android' or 'npx react-native run-ios'")
+
+
+# Compiled plan and options shared by every target handled in a batch worker process
+_worker_plan = None
+_worker_options = None
+
+
+def _init_worker(compiled, options):
+    """Receive the compiled plan and options once per worker instead of once per target"""
+    global _worker_plan, _worker_options
+    _worker_plan = compiled
+    _worker_options = options
+
+
+def _scaffold_target(target, phases=False):
+    """Scaffold one target from the shared plan; returns its output, totals and, with phases, its PhaseStats"""
+    output = io.StringIO()
+    collected = []
+    reporter = Reporter(_worker_options.report, stream=output, hooks=(collected.append,) if phases else (),
+                        target=target)
+    totals = _scaffold_one(_worker_plan, target, _worker_options, reporter,
+                           summary=_worker_options.report in _TARGET_SUMMARIES)
+    return output.getvalue(), totals, collected
+
+
+def _collect(results, hooks):
+    """Write each target's output and pass its phases to hooks, in order; returns the totals"""
+    all_totals = []
+    for output, totals, phases in results:
+        sys.stdout.write(output)
+        for stats in phases:
+            for hook in hooks:
+                hook(stats)
+        all_totals.append(totals)
+    return all_totals
+
+
+def create_many_structures(targets, processes=None, options=None, hooks=(), plan=None, **overrides):
+    """Scaffold several destinations concurrently with a process pool.
+
+    The plan, including every template body, is compiled once in the parent
+    and handed to each worker when it starts. Output from each target is
+    written as a block, in the order the targets were given, followed by
+    totals for the whole batch. options and keyword arguments are as for
+    create_treasure_hunter_structure(); with a store, identical files are
+    written once into the ContentStore and linked into every target. Each
+    of hooks is called in this process with every target's PhaseStats, in
+    target order, as its output is written. plan, a CompiledPlan, is
+    scaffolded instead of the Treasure Hunter plan when given. Returns the
+    totals for the whole batch.
+    """
+    options = (options or ScaffoldOptions())._replace(**overrides)
+    compiled = plan or _compile_plan(options)
+    # The compiled plan carries its renderer, so workers need none of the plan sources
+    worker_options = options._replace(templates=None, variables=None, render_cache=None)
+    scaffold = functools.partial(_scaffold_target, phases=bool(hooks))
+    reporter = Reporter(options.report)
+    if processes == 1 or len(targets) == 1:
+        _init_worker(compiled, worker_options)
+        all_totals = _collect(map(scaffold, targets), hooks)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        workers = processes or os.cpu_count() or 1
+        chunksize = max(1, len(targets) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(compiled, worker_options)) as pool:
+            all_totals = _collect(pool.map(scaffold, targets, chunksize=chunksize), hooks)
+    totals = merge_totals(all_totals)
+    totals["elapsed_ms"] = reporter.totals()["elapsed_ms"]
+    reporter.finish(f"{len(targets)} Treasure Hunter workspaces", totals)
+    return totals
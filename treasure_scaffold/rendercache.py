@@ -0,0 +1,178 @@
+"""Rendered template output kept on disk between runs"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .backends import TEMP_SUFFIX
+from .constants import RENDER_CACHE_SIZE
+
+# Bumped when the entry layout changes
+RENDER_CACHE_FORMAT = 1
+# Hits refresh an entry's mtime, the LRU clock, at most this often
+_TOUCH_INTERVAL_NS = 3600 * 10**9
+_LEDGER = "size"
+_LOCK = "lock"
+
+_code_version = None
+
+
+def scaffolder_version():
+    """Fingerprint of the rendering code, so a changed renderer never reuses old output"""
+    global _code_version
+    if _code_version is None:
+        from . import templates
+        with open(templates.__file__, 'rb') as f:
+            source = f.read()
+        _code_version = hashlib.sha256(b"%d\0" % RENDER_CACHE_FORMAT + source).hexdigest()[:16]
+    return _code_version
+
+
+class RenderCache:
+    """Directory of rendered outputs shared by every scaffolder run that points at it.
+
+    Entries are keyed by a hash of the template name and source, the
+    variables and scaffolder_version(), so a key never goes stale; a
+    changed input is simply a new key. Each entry is the sha256 of its
+    body followed by the body, checked on every read.
+
+    Writers go through a temporary file and a rename, so concurrent
+    readers see a whole entry or none. A ledger of the total size is
+    updated under an flock; once it passes max_bytes the least recently
+    used entries (by mtime, refreshed on hits) are removed until the
+    cache is back under three quarters of the bound.
+    """
+
+    def __init__(self, root, max_bytes=RENDER_CACHE_SIZE):
+        if max_bytes <= 0:
+            raise ValueError("The render cache size must be positive")
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Hash state after the version and each set of variables, as keys share them
+        self._prefixes = {}
+
+    def __getstate__(self):
+        return {"root": self.root, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["root"], state["max_bytes"])
+
+    def key(self, name, source, variables):
+        """Cache key for rendering template name, with body source, with frozen variables"""
+        prefix = self._prefixes.get(variables)
+        if prefix is None:
+            prefix = hashlib.sha256(f"{scaffolder_version()}\0{json.dumps(variables)}\0".encode("utf-8"))
+            self._prefixes[variables] = prefix
+        digest = prefix.copy()
+        digest.update(name.encode("utf-8") + b"\0")
+        digest.update(source)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key[2:])
+
+    def get(self, key):
+        """Cached body for key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                data = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        body = data[32:]
+        if hashlib.sha256(body).digest() != data[:32]:
+            # Torn or damaged entry; drop it and render again
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            self.misses += 1
+            return None
+        if time.time_ns() - stat.st_mtime_ns > _TOUCH_INTERVAL_NS:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+        self.hits += 1
+        return body
+
+    def put(self, key, body):
+        """Store body under key"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{TEMP_SUFFIX}"
+        data = hashlib.sha256(body).digest() + body
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        self._account(len(data))
+
+    def _account(self, added):
+        """Add to the size ledger, trimming the cache when it passes the bound"""
+        with self._lock, self._locked():
+            ledger = os.path.join(self.root, _LEDGER)
+            try:
+                with open(ledger) as f:
+                    total = int(f.read() or 0)
+            except (FileNotFoundError, ValueError):
+                total = 0
+            total += added
+            if total > self.max_bytes:
+                total = self._trim(self.max_bytes * 3 // 4)
+            temp_path = f"{ledger}.{os.getpid()}{TEMP_SUFFIX}"
+            with open(temp_path, 'w') as f:
+                f.write(str(total))
+            os.replace(temp_path, ledger)
+
+    def _trim(self, target):
+        """Remove least recently used entries until at most target bytes remain; returns the total"""
+        entries = []
+        for folder in os.listdir(self.root):
+            directory = os.path.join(self.root, folder)
+            if len(folder) != 2 or not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if name.endswith(TEMP_SUFFIX):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
+
+    def _locked(self):
+        """Context manager holding the cache-wide lock across processes"""
+        import contextlib
+        os.makedirs(self.root, exist_ok=True)
+        try:
+            import fcntl
+        except ImportError:
+            # No flock here; the ledger may drift, and the next trim corrects it
+            return contextlib.nullcontext()
+
+        @contextlib.contextmanager
+        def hold():
+            with open(os.path.join(self.root, _LOCK), 'a') as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        return hold()
@@ -0,0 +1,167 @@
+"""Progress output, counters and phase timing"""
+import collections
+import contextlib
+import json
+import sys
+import time
+from collections import namedtuple
+
+from .constants import REPORT_MODES
+
+PhaseStats = namedtuple("PhaseStats", ["phase", "seconds", "syscalls", "bytes"])
+_FILE_MESSAGES = {
+    "create": "Created file",
+    "update": "Updated file",
+    "modified": "Skipped locally modified file",
+    "merged": "Merged template changes into",
+    "conflict": "Skipped conflicting changes in",
+}
+
+
+class Reporter:
+    """Counts what a run does and reports it in one of REPORT_MODES.
+
+    - "verbose": a line per created directory and changed file, then a summary.
+    - "summary": only the end-of-run summary.
+    - "quiet": nothing at all.
+    - "jsonl": one JSON object per directory and file event, then a summary object.
+
+    Lines are collected in memory and written in large chunks, and the
+    quiet and summary modes only bump counters on the hot path. stream
+    defaults to whatever sys.stdout is when the buffer is flushed.
+
+    Each hook is called with a PhaseStats when a phase ends: its wall time,
+    the system calls the backend issued during it and the bytes it wrote.
+    target names the destination being reported on; every jsonl event
+    carries it, so the events of many targets in one log can be told apart.
+    """
+
+    def __init__(self, mode="verbose", stream=None, buffer_limit=1 << 16, hooks=(), target=None):
+        if mode not in REPORT_MODES:
+            raise ValueError(f"Unknown report mode: {mode}")
+        self.mode = mode
+        self.stream = stream
+        self.counts = collections.Counter()
+        self.phases = collections.Counter()
+        self.syscalls = collections.Counter()
+        self.hooks = list(hooks)
+        self.target = target
+        self._verbose = mode == "verbose"
+        self._jsonl = mode == "jsonl"
+        self._lines = []
+        self._buffered = 0
+        self._buffer_limit = buffer_limit
+        self._start = time.perf_counter()
+
+    def emit(self, line):
+        """Queue one line of output"""
+        if self.mode == "quiet":
+            return
+        self._lines.append(line)
+        self._buffered += len(line)
+        if self._buffered >= self._buffer_limit:
+            self.flush()
+
+    def flush(self):
+        """Write out queued lines"""
+        if self._lines:
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(self._lines) + "\n")
+            stream.flush()
+            self._lines = []
+            self._buffered = 0
+
+    @contextlib.contextmanager
+    def phase(self, name, backend=None):
+        """Measure a named phase, attributing backend system calls to it"""
+        syscalls_before = collections.Counter(backend.syscalls) if backend is not None else None
+        bytes_before = self.counts["bytes"]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.phases[name] += seconds
+            syscalls = {}
+            if syscalls_before is not None:
+                syscalls = dict(backend.syscalls - syscalls_before)
+                self.syscalls.update(syscalls)
+            if self.hooks or self._jsonl:
+                stats = PhaseStats(name, seconds, syscalls, self.counts["bytes"] - bytes_before)
+                for hook in self.hooks:
+                    hook(stats)
+                if self._jsonl:
+                    self.emit(json.dumps({"event": "phase", "target": self.target, **stats._asdict()}))
+
+    def directory_created(self, backend, path):
+        """Record a directory created by the run"""
+        self.counts["directories"] += 1
+        if self._verbose:
+            self.emit(f"Created directory: {backend.describe(path)}")
+        elif self._jsonl:
+            self.emit(json.dumps({"event": "directory", "target": self.target, "path": path}))
+
+    def file_processed(self, backend, path, status, size):
+        """Record the classify_file() outcome for a planned file"""
+        self.counts[status] += 1
+        if status in ("create", "update", "merged"):
+            self.counts["bytes"] += size
+        if self._verbose:
+            message = _FILE_MESSAGES.get(status)
+            if message:
+                self.emit(f"{message}: {backend.describe(path)}")
+        elif self._jsonl:
+            self.emit(json.dumps({"event": "file", "target": self.target, "path": path, "status": status,
+                                   "bytes": size}))
+
+    def totals(self):
+        """Counters and per-phase milliseconds for the run so far"""
+        counts = self.counts
+        return {
+            "directories": counts["directories"],
+            "created": counts["create"],
+            "updated": counts["update"],
+            "unchanged": counts["unchanged"],
+            "skipped": counts["modified"] + counts["unmanaged"] + counts["conflict"],
+            "merged": counts["merged"],
+            "conflicts": counts["conflict"],
+            "bytes": counts["bytes"],
+            "syscalls": dict(self.syscalls),
+            "elapsed_ms": round((time.perf_counter() - self._start) * 1000, 3),
+            "phases_ms": {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+        }
+
+    def finish(self, target, totals=None):
+        """Emit the summary for target and flush everything"""
+        totals = totals or self.totals()
+        if self._jsonl:
+            self.emit(json.dumps({"event": "summary", "target": target, **totals}))
+        elif self.mode != "quiet":
+            phases = ", ".join(f"{name} {ms:.1f}" for name, ms in totals["phases_ms"].items())
+            parts = [f"{totals['directories']} directories", f"{totals['created']} files created",
+                     f"{totals['updated']} updated"]
+            if totals["merged"] or totals["conflicts"]:
+                parts += [f"{totals['merged']} merged", f"{totals['conflicts']} conflicts"]
+            parts += [f"{totals['unchanged']} unchanged", f"{totals['skipped']} skipped",
+                      f"{totals['bytes']} bytes", f"{sum(totals['syscalls'].values())} syscalls"]
+            self.emit(
+                f"{target}: {', '.join(parts)} in {totals['elapsed_ms']:.1f} ms"
+                + (f" ({phases})" if phases else "")
+            )
+        self.flush()
+
+
+def merge_totals(all_totals):
+    """Add up the totals() of several runs"""
+    merged = {"directories": 0, "created": 0, "updated": 0, "unchanged": 0, "skipped": 0, "merged": 0,
+              "conflicts": 0, "bytes": 0,
+              "syscalls": collections.Counter(), "elapsed_ms": 0.0, "phases_ms": collections.Counter()}
+    for totals in all_totals:
+        for key, value in totals.items():
+            if isinstance(value, dict):
+                merged[key].update(value)
+            else:
+                merged[key] += value
+    merged["syscalls"] = dict(merged["syscalls"])
+    merged["phases_ms"] = {name: round(ms, 3) for name, ms in merged["phases_ms"].items()}
+    return merged
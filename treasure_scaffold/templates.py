@@ -0,0 +1,326 @@
+"""Template sources, @@NAME@@ variables and the caching renderer"""
+import json
+import os
+import re
+
+from .paths import _native_path, _normalize, _path_key
+
+
+# Template sources live beside set-up.py, mirroring the generated tree
+# with a .tmpl suffix; --pack-templates bundles them into templates.pack.
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_DIR = os.path.join(_ROOT, "templates")
+TEMPLATE_PACK = os.path.join(_ROOT, "templates.pack")
+TEMPLATE_SUFFIX = ".tmpl"
+PACK_MAGIC = b"THPK\x01"
+
+
+class DirectoryTemplates:
+    """Reads template sources from a directory, one file per request"""
+
+    def __init__(self, root=TEMPLATE_DIR):
+        self.root = root
+        self._cache = {}
+
+    def get(self, name):
+        """Raw bytes of one template"""
+        data = self._cache.get(name)
+        if data is None:
+            path = _native_path(self.root, name) + TEMPLATE_SUFFIX
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                raise KeyError(f"Unknown template: {name}") from None
+            self._cache[name] = data
+        return data
+
+    def names(self):
+        """Every template name available"""
+        names = []
+        for folder, _, files in os.walk(self.root):
+            relative = os.path.relpath(folder, self.root)
+            for file_name in files:
+                if file_name.endswith(TEMPLATE_SUFFIX):
+                    path = os.path.join(relative, file_name[:-len(TEMPLATE_SUFFIX)])
+                    names.append(_normalize(path))
+        return sorted(names, key=_path_key)
+
+
+class TemplateBundle:
+    """Templates packed into a single file and decoded on first use.
+
+    The file is memory-mapped, so opening it costs one read of the index and
+    only the bodies that are asked for are paged in and decompressed. Layout:
+    PACK_MAGIC, a little-endian u32 index length, a JSON index mapping each
+    name to [offset, length, codec] relative to the end of the index, then
+    the bodies. codec is "raw" or "zlib".
+    """
+
+    def __init__(self, path=TEMPLATE_PACK):
+        self.path = path
+        self._map = None
+        self._index = None
+        self._cache = {}
+
+    def _open(self):
+        import mmap
+        import struct
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = len(PACK_MAGIC) + 4
+        if self._map[:len(PACK_MAGIC)] != PACK_MAGIC:
+            raise ValueError(f"{self.path} is not a template bundle")
+        (index_length,) = struct.unpack_from("<I", self._map, len(PACK_MAGIC))
+        self._index = json.loads(self._map[header:header + index_length])
+        self._start = header + index_length
+
+    def get(self, name):
+        """Raw bytes of one template"""
+        data = self._cache.get(name)
+        if data is None:
+            if self._index is None:
+                self._open()
+            try:
+                offset, length, codec = self._index[name]
+            except KeyError:
+                raise KeyError(f"Unknown template: {name}") from None
+            data = self._map[self._start + offset:self._start + offset + length]
+            if codec == "zlib":
+                import zlib
+                data = zlib.decompress(data)
+            self._cache[name] = data
+        return data
+
+    def names(self):
+        """Every template name available"""
+        if self._index is None:
+            self._open()
+        return sorted(self._index, key=_path_key)
+
+    def __getstate__(self):
+        # The mapping cannot be pickled; worker processes map the file again
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+
+def pack_templates(source=TEMPLATE_DIR, output=TEMPLATE_PACK, compress=True):
+    """Bundle every template under source into a single pack file.
+
+    Each body is zlib-compressed when compress is set and that makes it
+    smaller. Returns the number of templates packed.
+    """
+    import struct
+    import zlib
+    templates = DirectoryTemplates(source)
+    index = {}
+    bodies = []
+    offset = 0
+    for name in templates.names():
+        data = templates.get(name)
+        codec = "raw"
+        if compress:
+            packed = zlib.compress(data, 9)
+            if len(packed) < len(data):
+                data, codec = packed, "zlib"
+        index[name] = [offset, len(data), codec]
+        bodies.append(data)
+        offset += len(data)
+    index_bytes = json.dumps(index, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    with open(f"{output}.tmp", 'wb') as f:
+        f.write(PACK_MAGIC + struct.pack("<I", len(index_bytes)) + index_bytes)
+        f.writelines(bodies)
+    os.replace(f"{output}.tmp", output)
+    return len(index)
+
+
+def _pack_is_current(pack, source):
+    """Whether pack exists and was built after every file and folder under source last changed.
+
+    A tie counts as stale: timestamps are coarse, so an edit made just after
+    packing can carry the pack's own mtime.
+    """
+    try:
+        built = os.stat(pack).st_mtime_ns
+    except FileNotFoundError:
+        return False
+    folders = [source]
+    while folders:
+        folder = folders.pop()
+        try:
+            # A folder's mtime moves when a template is added, removed or renamed in it
+            if os.stat(folder).st_mtime_ns >= built:
+                return False
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        folders.append(entry.path)
+                    elif entry.stat().st_mtime_ns >= built:
+                        return False
+        except FileNotFoundError:
+            continue
+    return True
+
+
+def load_templates(path=None):
+    """Template source for a plan.
+
+    path may name a pack file or a directory of sources. By default the
+    built templates.pack is used while it is newer than everything under
+    templates/; once a source is edited, templates/ is read until the pack
+    is rebuilt, so a run never writes output from stale templates. Neither
+    is opened until a template is first requested.
+    """
+    if path is None:
+        path = TEMPLATE_PACK if _pack_is_current(TEMPLATE_PACK, TEMPLATE_DIR) else TEMPLATE_DIR
+    if os.path.isdir(path):
+        return DirectoryTemplates(path)
+    return TemplateBundle(path)
+
+
+# Values substituted into @@NAME@@ placeholders; override with --var/--vars-file.
+# They are inserted verbatim, so they must already suit the file they land in.
+DEFAULT_VARIABLES = {
+    "PACKAGE_NAME": "treasure-hunter",
+    "APP_VERSION": "0.1.0",
+    "REACT_VERSION": "^18.2.0",
+    "REACT_NATIVE_VERSION": "^0.72.0",
+    "API_BASE_URL": "https://api.treasurehunter.com",
+    "API_TIMEOUT": "10000",
+    "PRIMARY_COLOR": "#A36F09",
+    "SECONDARY_COLOR": "#D4AF37",
+    "BACKGROUND_COLOR": "#F9F5EB",
+}
+
+_PLACEHOLDER = re.compile(rb"@@([A-Z][A-Z0-9_]*)@@")
+
+
+def compile_template(name, source):
+    """Turn a template body into a function rendering it from a variables dict.
+
+    The body is split around its placeholders once, so rendering is a single
+    join of the literal pieces and the encoded values.
+    """
+    pieces = _PLACEHOLDER.split(source)
+    if len(pieces) == 1:
+        return lambda variables: source
+    literals = pieces[0::2]
+    names = [piece.decode("ascii") for piece in pieces[1::2]]
+
+    def render(variables):
+        parts = [literals[0]]
+        for variable, literal in zip(names, literals[1:]):
+            try:
+                parts.append(variables[variable].encode("utf-8"))
+            except KeyError:
+                raise KeyError(f"Template {name} uses undefined variable {variable}") from None
+            parts.append(literal)
+        return b"".join(parts)
+
+    return render
+
+
+def freeze_variables(variables=None):
+    """Defaults merged with overrides, as a hashable render cache key"""
+    merged = dict(DEFAULT_VARIABLES)
+    if variables:
+        unknown = sorted(set(variables) - set(DEFAULT_VARIABLES))
+        if unknown:
+            raise ValueError(f"Unknown template variables: {', '.join(unknown)}")
+        invalid = sorted(name for name, value in variables.items() if not isinstance(value, str))
+        if invalid:
+            raise ValueError(f"Template variables must be strings: {', '.join(invalid)}")
+        merged.update(variables)
+    return tuple(sorted(merged.items()))
+
+
+def read_variables(vars_file=None, assignments=()):
+    """Variable overrides from a JSON file and then NAME=VALUE assignments.
+
+    The file must hold a JSON object; numbers and booleans in it are taken
+    as they are spelled in JSON, so {"API_TIMEOUT": 5000} means "5000".
+    Raises ValueError for a malformed file or assignment, or an unknown name,
+    and OSError if the file cannot be read.
+    """
+    variables = {}
+    if vars_file:
+        with open(vars_file) as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, dict):
+            raise ValueError(f"{vars_file} must hold a JSON object of variables, not {type(loaded).__name__}")
+        for name, value in loaded.items():
+            if isinstance(value, (bool, int, float)):
+                value = json.dumps(value)
+            elif not isinstance(value, str):
+                raise ValueError(f"Variable {name} in {vars_file} must be a string, number or boolean")
+            variables[name] = value
+    for assignment in assignments:
+        name, separator, value = assignment.partition("=")
+        if not separator:
+            raise ValueError(f"--var expects NAME=VALUE, got {assignment!r}")
+        variables[name] = value
+    freeze_variables(variables)
+    return variables
+
+
+def template_variables(source):
+    """Names of the variables a template body uses"""
+    return {name.decode("ascii") for name in _PLACEHOLDER.findall(source)}
+
+
+class TemplateRenderer:
+    """Renders named templates, compiling each one once per process.
+
+    Rendered bytes are kept in an LRU cache keyed by template name and
+    frozen variables, so scaffolding the same variant again costs a dict
+    lookup. With persistent, a RenderCache, output rendered by earlier
+    runs is read back from disk instead of compiling the template.
+    """
+
+    def __init__(self, templates, cache_size=1024, persistent=None):
+        import functools
+        self.templates = templates
+        self.cache_size = cache_size
+        self.persistent = persistent
+        self._compiled = {}
+        self.render = functools.lru_cache(maxsize=cache_size)(self._render)
+
+    def compiled(self, name):
+        """Render function for one template"""
+        render = self._compiled.get(name)
+        if render is None:
+            render = compile_template(name, self.templates.get(name))
+            self._compiled[name] = render
+        return render
+
+    def _render(self, name, variables):
+        # variables is the tuple from freeze_variables()
+        if self.persistent is None:
+            return self.compiled(name)(dict(variables))
+        key = self.persistent.key(name, self.templates.get(name), variables)
+        data = self.persistent.get(key)
+        if data is None:
+            data = self.compiled(name)(dict(variables))
+            self.persistent.put(key, data)
+        return data
+
+    def __getstate__(self):
+        # Caches stay behind; each worker process builds its own
+        return {"templates": self.templates, "cache_size": self.cache_size, "persistent": self.persistent}
+
+    def __setstate__(self, state):
+        self.__init__(state["templates"], state["cache_size"], state.get("persistent"))
+
+
+# Renderer for the default template source, shared by every plan in the process
+_default_renderer = None
+
+
+def default_renderer():
+    """Renderer over load_templates(), created on first use"""
+    global _default_renderer
+    if _default_renderer is None:
+        _default_renderer = TemplateRenderer(load_templates())
+    return _default_renderer
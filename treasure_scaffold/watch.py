@@ -0,0 +1,132 @@
+"""Watch template sources and variables, re-rendering only the outputs they affect"""
+import os
+import sys
+import time
+
+from .constants import WATCH_INTERVAL
+from .groups import build_treasure_hunter_plan
+from .project import ScaffoldOptions, _scaffold_one
+from .report import Reporter
+from .templates import TEMPLATE_DIR, TEMPLATE_SUFFIX, load_templates, read_variables, template_variables
+
+# How long sources must stay unchanged before a rebuild
+WATCH_DEBOUNCE = 0.1
+
+
+def _source_paths(templates_path, vars_file):
+    """Every file whose change can alter the output"""
+    paths = []
+    if os.path.isdir(templates_path):
+        for folder, _, files in os.walk(templates_path):
+            paths.extend(os.path.join(folder, name) for name in files if name.endswith(TEMPLATE_SUFFIX))
+    else:
+        paths.append(templates_path)
+    if vars_file:
+        paths.append(vars_file)
+    return paths
+
+
+def _snapshot(paths):
+    """Size and mtime of each path, None for a missing one"""
+    state = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            state[path] = None
+        else:
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def affected_files(compiled, changed_templates, changed_variables):
+    """Planned files rendered from a changed template or using a changed variable"""
+    affected = []
+    for entry in compiled.files:
+        if entry.template is None:
+            continue
+        if entry.template in changed_templates:
+            affected.append(entry)
+        elif changed_variables:
+            source = compiled.renderer.templates.get(entry.template)
+            if changed_variables & template_variables(source):
+                affected.append(entry)
+    return tuple(affected)
+
+
+class _Sources:
+    """The template bodies and variables a build was made from"""
+
+    def __init__(self, templates_path, vars_file, assignments, groups, render_cache=None):
+        self.templates = load_templates(templates_path)
+        self.variables = read_variables(vars_file, assignments)
+        self.compiled = build_treasure_hunter_plan(self.templates, groups, self.variables, render_cache).compile()
+        self.bodies = {entry.template: self.templates.get(entry.template)
+                       for entry in self.compiled.files if entry.template is not None}
+
+
+def _apply(compiled, destinations, options):
+    """Execute a plan against every destination, one summary line each"""
+    for destination in destinations:
+        _scaffold_one(compiled, destination, options, Reporter(options.report, target=destination))
+
+
+def watch(destinations, templates_path=None, vars_file=None, assignments=(), options=None,
+          interval=WATCH_INTERVAL, debounce=WATCH_DEBOUNCE, stop=None, **overrides):
+    """Scaffold destinations, then keep them in step with their sources.
+
+    Template sources (templates/ by default, not templates.pack, since the
+    sources are what gets edited) and vars_file are polled every interval
+    seconds. Once a change has settled for debounce seconds, the plan is
+    rebuilt and only the files whose template body or variables changed
+    are re-rendered and written; the manifest still protects files edited
+    by hand, or with options.merge takes the change through a three-way
+    merge. options and keyword arguments are as for
+    create_treasure_hunter_structure(), except that the templates and
+    variables come from templates_path, vars_file and assignments. Runs
+    until interrupted or until stop, a threading.Event, is set.
+    """
+    templates_path = templates_path or TEMPLATE_DIR
+    options = (options or ScaffoldOptions())._replace(**overrides)
+    sources = _Sources(templates_path, vars_file, assignments, options.groups, options.render_cache)
+    _apply(sources.compiled, destinations, options)
+    paths = _source_paths(templates_path, vars_file)
+    state = _snapshot(paths)
+    print(f"Watching {len(paths)} sources for changes (Ctrl+C to stop)", file=sys.stderr)
+
+    try:
+        while stop is None or not stop.is_set():
+            time.sleep(interval)
+            current = _snapshot(paths)
+            if current == state:
+                continue
+            # Editors often save in several steps; wait for the files to settle
+            while True:
+                time.sleep(debounce)
+                settled = _snapshot(_source_paths(templates_path, vars_file))
+                if settled == current:
+                    break
+                current = settled
+            detected = time.perf_counter()
+            paths, state = list(current), current
+            try:
+                previous, sources = sources, _Sources(templates_path, vars_file, assignments, options.groups,
+                                                      options.render_cache)
+            except (OSError, KeyError, ValueError) as error:
+                print(f"Not rebuilding: {error}", file=sys.stderr)
+                continue
+            changed_templates = {name for name, body in sources.bodies.items() if previous.bodies.get(name) != body}
+            changed_variables = {name for name in set(previous.variables) | set(sources.variables)
+                                 if previous.variables.get(name) != sources.variables.get(name)}
+            affected = affected_files(sources.compiled, changed_templates, changed_variables)
+            if not affected:
+                continue
+            try:
+                _apply(sources.compiled._replace(directories=(), files=affected), destinations, options)
+            except (OSError, KeyError, ValueError) as error:
+                print(f"Rebuild failed: {error}", file=sys.stderr)
+                continue
+            print(f"Rebuilt {len(affected)} affected files in {(time.perf_counter() - detected) * 1000:.1f} ms",
+                  file=sys.stderr)
+    except KeyboardInterrupt:
+        pass